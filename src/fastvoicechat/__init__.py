@@ -4,12 +4,13 @@
 
 - :class:`fastvoicechat.fvchat.FastVoiceChat`: メインの音声チャットクラス
 - :class:`fastvoicechat.base.CallbackLoop`: コールバックループの基本クラス
+- :func:`fastvoicechat.base.mark_blocking`: 同期コールバックをスレッドで実行させるデコレータ
 - :func:`fastvoicechat.factory.create_fastvoicechat`: FastVoiceChatインスタンスを作成するファクトリ関数
 """
 
-from .base import CallbackLoop
+from .base import CallbackLoop, mark_blocking
 from .factory import create_fastvoicechat
 from .fvchat import FastVoiceChat
 
 # パブリックAPIとして公開するクラスと関数
-__all__ = ["FastVoiceChat", "CallbackLoop", "create_fastvoicechat"]
+__all__ = ["FastVoiceChat", "CallbackLoop", "create_fastvoicechat", "mark_blocking"]
@@ -1,6 +1,72 @@
 import asyncio
 import logging
 import traceback
+from typing import Awaitable, Callable, Iterable, Optional, TypeVar
+
+F = TypeVar("F", bound=Callable)
+T = TypeVar("T")
+
+# mark_blockingで付与する属性名
+_BLOCKING_ATTR = "__fastvoicechat_blocking__"
+
+
+def mark_blocking(func: F) -> F:
+    """
+    同期コールバックをブロッキング処理として登録するデコレータ
+
+    同期コールバックは通常イベントループ上でそのまま呼び出されます。
+    時間のかかる処理（I/Oなど）を行うコールバックはこのデコレータを付けると、
+    executorのスレッドで実行されるようになります。
+
+    Args:
+        func: 同期コールバック
+
+    Returns:
+        属性を付与した同じ関数
+    """
+    setattr(func, _BLOCKING_ATTR, True)
+    return func
+
+
+def is_blocking(func: Callable) -> bool:
+    """
+    mark_blockingが付与されたコールバックかどうか
+
+    Args:
+        func: コールバック
+
+    Returns:
+        bool: ブロッキング処理として登録されていればTrue
+    """
+    return getattr(func, _BLOCKING_ATTR, False)
+
+
+async def aget_until(
+    aget: Callable[[], Awaitable[T]], waiters: Iterable[asyncio.Future]
+) -> Optional[T]:
+    """
+    waitersのいずれかが完了するまでaget()の結果を待つ
+
+    タイムアウト付きで取得を繰り返して停止を確認する代わりに使います。
+    waitersはループのたびに作り直さず、呼び出し側で使い回してください。
+
+    Args:
+        aget: 値を取得するコルーチン関数（asyncio.Queue.getなど）
+        waiters: 停止を知らせるFuture（Event.waitのタスクなど）
+
+    Returns:
+        取得した値。先にwaitersが完了した場合はNone
+    """
+    getter = asyncio.ensure_future(aget())
+    try:
+        await asyncio.wait({getter, *waiters}, return_when=asyncio.FIRST_COMPLETED)
+        if getter.done():
+            return getter.result()
+        return None
+    finally:
+        # 呼び出し側がキャンセルされた場合も、取り残した取得で値を消費しないようにする
+        if not getter.done():
+            getter.cancel()
 
 
 class CallbackLoop:
@@ -21,6 +87,16 @@ class CallbackLoop:
         for k, v in kwargs.items():
             self.set(k, v)
 
+    @property
+    def callback(self):
+        return self._callback
+
+    @callback.setter
+    def callback(self, value):
+        # 呼び出し方はループのたびに判定せず、設定時に1回だけ判定する
+        self._callback = value
+        self._callback_is_coro = asyncio.iscoroutinefunction(value)
+
     async def aget(self, key):
         """状態から値を取得"""
         async with self._lock:
@@ -42,7 +118,7 @@ class CallbackLoop:
             while not self.stop_event.is_set():
                 if self.callback:
                     # コールバックが非同期関数か確認して適切に呼び出す
-                    if asyncio.iscoroutinefunction(self.callback):
+                    if self._callback_is_coro:
                         await self.callback()
                     else:
                         loop = asyncio.get_running_loop()
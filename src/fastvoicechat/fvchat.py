@@ -1,14 +1,28 @@
 import asyncio
 import logging
+import threading
 import time
 import traceback
-from typing import Any, Dict, List, Optional, Tuple
+import weakref
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Coroutine,
+    Dict,
+    List,
+    Optional,
+    Self,
+    Tuple,
+    TypeVar,
+)
 
-from fastvoicechat.base import CallbackLoop
-from fastvoicechat.llm import LLM
+from fastvoicechat.llm import LLM, ConversationHistory, SemanticCache
 from fastvoicechat.stt import STT, create_stt
 from fastvoicechat.tts import TTS
 
+T = TypeVar("T")
+
 # スレッド版と同じシステムプロンプトを使用
 BACKCHANNEL_SYSTEM_PROMPT = (
     "対話履歴を踏まえて適切な相槌を生成してください。"
@@ -24,6 +38,74 @@ ANSWER_SYSTEM_PROMPT = (
     "また、これは音声対話であるため、回答はなるべく短く簡潔にしてください。"
 )
 
+# 合成結果を事前にキャッシュしておく定番の相槌
+BACKCHANNEL_PREWARM_TEXTS = (
+    "うん",
+    "うんうん",
+    "あー",
+    "えーっと",
+    "うーん",
+    "へー",
+    "なるほど",
+    "そうなんだ",
+    "はい",
+    "そうですね",
+)
+
+# 同期APIから使用するイベントループ（初回使用時にデーモンスレッドで起動）
+_background_loop: Optional[asyncio.AbstractEventLoop] = None
+_background_loop_lock = threading.Lock()
+
+
+def _get_background_loop() -> asyncio.AbstractEventLoop:
+    """同期APIで共有するイベントループを取得
+
+    初回呼び出し時にイベントループを専用のデーモンスレッドで起動し、
+    以降はプロセス終了まで同じループを使い続けます。
+    """
+    global _background_loop
+    with _background_loop_lock:
+        if _background_loop is None:
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(
+                target=loop.run_forever, name="FastVoiceChatLoop", daemon=True
+            )
+            thread.start()
+            _background_loop = loop
+    return _background_loop
+
+
+def _run_in_background_loop(coro: Coroutine[Any, Any, T]) -> T:
+    """コルーチンをバックグラウンドのイベントループで実行し、結果を待つ"""
+    future = asyncio.run_coroutine_threadsafe(coro, _get_background_loop())
+    try:
+        return future.result()
+    except BaseException:
+        # Ctrl+Cなどで待機が中断された場合はコルーチンも止める
+        future.cancel()
+        raise
+
+
+def _close_resources(loop: asyncio.AbstractEventLoop, tts: TTS, *llms: LLM) -> None:
+    """FastVoiceChatがastopされずに破棄された際、HTTPクライアントを解放する
+
+    weakref.finalizeから呼ばれるため、FastVoiceChat自体への参照は持たず、
+    コンポーネントを生成したイベントループ上で解放処理を予約するだけに留めます。
+    """
+    if loop.is_closed():
+        return
+
+    async def aclose():
+        await asyncio.gather(
+            tts.aclose(), *(llm.aclose() for llm in llms), return_exceptions=True
+        )
+
+    try:
+        asyncio.run_coroutine_threadsafe(aclose(), loop)
+    except RuntimeError:
+        # ループが既に閉じられている場合は何もしない
+        pass
+
 
 class FastVoiceChat:
     """音声対話を高速に行うための非同期クラス
@@ -42,6 +124,7 @@ class FastVoiceChat:
         allow_interrupt (bool): ユーザーの割り込み発話を許可するかどうか
         llm_backchannel (:class:`fastvoicechat.llm.LLM`): 相槌生成用の言語モデル
         llm_answer (:class:`fastvoicechat.llm.LLM`): 応答生成用の言語モデル
+        history (:class:`fastvoicechat.llm.ConversationHistory`): 両言語モデルで共有する会話履歴
 
     Example:
         >>> from fastvoicechat import FastVoiceChat
@@ -56,72 +139,103 @@ class FastVoiceChat:
         >>> # TTSエンジンの初期化
         >>> tts = TTS(synthesizer=synthesizer, player=player)
         >>>
-        >>> # FastVoiceChatの初期化と開始
-        >>> chat = FastVoiceChat(tts=tts)
-        >>> await chat.astart()
-        >>>
-        >>> # 対話の実行
-        >>> responses = await chat.utter_after_listening()
-        >>>
-        >>> # 終了処理
-        >>> await chat.astop()
+        >>> # FastVoiceChatの初期化と開始（ブロックを抜けると停止してリソースを解放）
+        >>> async with FastVoiceChat(tts=tts) as chat:
+        ...     responses = await chat.autter_after_listening()
     """
 
     def __init__(
         self,
         *,
         tts: TTS,
-        stt_kwargs: Dict[str, Any] = {},
+        stt_kwargs: Optional[Dict[str, Any]] = None,
         allow_interrupt: bool = True,
         backchannel_system_prompt: str = BACKCHANNEL_SYSTEM_PROMPT,
         answer_system_prompt: str = ANSWER_SYSTEM_PROMPT,
         backchannel_model: str = "gpt-4o-mini",
         answer_model: str = "gpt-4o",
+        backchannel_cache_size: int = 32,
+        backchannel_cache_threshold: float = 0.92,
+        backchannel_min_delta_chars: int = 4,
+        backchannel_debounce_interval: float = 0.15,
+        pause_stt_during_playback: bool = True,
+        min_input_length: int = 2,
     ):
         """FastVoiceChatの初期化
 
         Args:
             tts (:class:`fastvoicechat.tts.TTS`): テキスト音声合成エンジン
-            stt_kwargs (Dict[str, Any]): 音声認識エンジンの設定パラメータ
+            stt_kwargs (Dict[str, Any], optional): 音声認識エンジンの設定パラメータ
             allow_interrupt (bool): ユーザーの割り込み発話を許可するかどうか
             backchannel_system_prompt (str): 相槌生成用のシステムプロンプト
             answer_system_prompt (str): 応答生成用のシステムプロンプト
             backchannel_model (str): 相槌生成に使用する言語モデル
             answer_model (str): 応答生成に使用する言語モデル
+            backchannel_cache_size (int): 相槌キャッシュの最大エントリ数。0で無効
+            backchannel_cache_threshold (float): 相槌キャッシュにヒットとみなす類似度
+            backchannel_min_delta_chars (int): 相槌生成をやり直す途中結果の増加文字数
+            backchannel_debounce_interval (float): 相槌生成をやり直すまでの最短間隔（秒）
+            pause_stt_during_playback (bool): 再生中に音声認識を一時停止するかどうか。
+                Falseにすると認識セッションを張り直さずに済みますが、スピーカーの音を
+                拾わないようヘッドセットやOS側のエコーキャンセルと併用してください
+            min_input_length (int): 途中結果から相槌を、発話から本回答を生成する最小文字数
         """
         self.tts = tts
         self.allow_interrupt = allow_interrupt
+        self.pause_stt_during_playback = pause_stt_during_playback
 
         self.backchannel_system_prompt = backchannel_system_prompt
         self.answer_system_prompt = answer_system_prompt
         self.backchannel_model = backchannel_model
         self.answer_model = answer_model
 
+        # 類似した途中結果に対する相槌を再利用するキャッシュ
+        self.backchannel_cache: Optional[SemanticCache] = None
+        if backchannel_cache_size > 0:
+            self.backchannel_cache = SemanticCache(
+                max_size=backchannel_cache_size,
+                threshold=backchannel_cache_threshold,
+            )
+
+        # 途中結果ごとの相槌生成を間引くための状態
+        self.backchannel_min_delta_chars = backchannel_min_delta_chars
+        self.backchannel_debounce_interval = backchannel_debounce_interval
+        self.min_input_length = min_input_length
+        self._last_backchannel_input = ""
+        self._last_backchannel_time = 0.0
+
         # 各コンポーネントの初期化
         self.stt: STT
-        self.stt_kwargs = stt_kwargs
+        self.stt_kwargs = stt_kwargs or {}
+        # create_sttに渡す引数は初期化時に確定させ、コールバックのみainitializeで設定する
+        self._resolved_stt_kwargs: Dict[str, Any] = {
+            **self.stt_kwargs,
+            "recognition_kwargs": {**self.stt_kwargs.get("recognition_kwargs", {})},
+        }
         self.llm_backchannel: LLM
         self.llm_answer: LLM
+        # 相槌生成用と応答生成用のLLMで共有する会話履歴
+        self.history = ConversationHistory()
 
         # 割り込み制御
         self.interrupt_event = asyncio.Event()
-        self.interruption_observer: CallbackLoop
-
-        # 処理ロック
-        self.processing_lock = asyncio.Lock()
+        self.interruption_observer: Optional[asyncio.Task] = None
+        # 相槌の生成中に投機的に本回答の生成を開始するタスク
+        self._speculative_answer_task: Optional[asyncio.Task] = None
 
         # 初期化フラグ
         self._initialized = False
         self._running = False
+        self._finalizer: Optional[weakref.finalize] = None
 
     async def ainitialize(self):
         """コンポーネントを非同期に初期化します。
 
         このメソッドは以下のコンポーネントを初期化します：
         - 音声認識エンジン（STT）
-        - 割り込み検出オブザーバー
         - 相槌生成用言語モデル
         - 応答生成用言語モデル
+        - 定番の相槌の音声合成キャッシュ
 
         各コンポーネントは非同期に初期化され、必要なコールバック関数も設定されます。
         二重初期化を防ぐため、既に初期化済みの場合は何もせずに終了します。
@@ -143,67 +257,57 @@ class FastVoiceChat:
             user_input = result.get("text", "")
             logging.info(f"[STT]: {user_input}")
 
-            # 相槌生成が必要かを判断
+            # 認識直後のごく短い途中結果では有用な相槌を生成できない
+            if self._is_too_short(user_input):
+                return
+
+            # 細かな途中結果ごとに生成を始めないよう間引く
+            is_final = result.get("type") == "final"
+            if not is_final and not self._is_backchannel_input_changed(user_input):
+                return
+
             if self.llm_backchannel and self.llm_backchannel.should_generate(
                 user_input
             ):
-                logging.info(f"[STT]: generation start: {user_input}")
-                await self.llm_backchannel.astart_generate_task(user_input)
-
-        # 割り込み検出用コールバック関数
-        async def ainterruption_observer_callback():
-            previous_result = await self.interruption_observer.aget("previous_result")
-
-            # 割り込みを検出: ユーザが話し始めた & TTSが再生中
-            interrupted = (
-                self.stt
-                and self.stt.is_speech_started
-                and self.tts
-                and self.tts.is_playing
-            )
-
-            await self.interruption_observer.aset("previous_result", interrupted)
-
-            if interrupted:
-                if self.allow_interrupt:
-                    self.interrupt_event.set()
-                    if not previous_result:
-                        logging.info("[Observer]: interruption detected.")
-                else:
-                    if not previous_result:
-                        logging.info(
-                            "[Observer]: interruption detected, but not allowed."
-                        )
+                await self._astart_backchannel(user_input)
 
         # 各コンポーネントの初期化
         logging.debug("Setting up AsyncFastSTT...")
-        stt_kwargs = self.stt_kwargs.copy()
-        stt_kwargs["recognition_kwargs"] = {
-            **stt_kwargs.get("recognition_kwargs", {}),
-            "callback": arecognition_callback,
-        }
-        self.stt = create_stt(**stt_kwargs)
-
-        logging.debug("Setting up AsyncCallbackLoop for interruption observer...")
-        self.interruption_observer = CallbackLoop(
-            callback=ainterruption_observer_callback,
-            interval=0.01,
-            name="InterruptionObserver",
-            previous_result=False,
+        self._resolved_stt_kwargs["recognition_kwargs"]["callback"] = (
+            arecognition_callback
         )
+        self.stt = create_stt(**self._resolved_stt_kwargs)
 
         logging.debug("Initializing AsyncLLM for backchannel and answer...")
         self.llm_backchannel = LLM(
             system_prompt=self.backchannel_system_prompt,
             model=self.backchannel_model,
             separator="、、。！？!?",
+            history=self.history,
+            # 読み上げられずに溜まった古い相槌は不要なので、上限を超えたら捨てる
+            max_queue_size=32,
         )
 
         self.llm_answer = LLM(
-            system_prompt=self.answer_system_prompt, model=self.answer_model
+            system_prompt=self.answer_system_prompt,
+            model=self.answer_model,
+            history=self.history,
+        )
+
+        # 定番の相槌を事前に合成しておき、再生時の合成待ちをなくす
+        logging.debug("Prewarming TTS cache for backchannels...")
+        await self.tts.aprewarm(BACKCHANNEL_PREWARM_TEXTS)
+
+        # astopを呼ばずに破棄された場合に備え、HTTPクライアントの解放を登録
+        self._finalizer = weakref.finalize(
+            self,
+            _close_resources,
+            asyncio.get_running_loop(),
+            self.tts,
+            self.llm_backchannel,
+            self.llm_answer,
         )
 
-        # TTSの初期化部分を削除
         self._initialized = True
         logging.debug("AsyncFastVoiceChat initialization complete")
 
@@ -236,8 +340,10 @@ class FastVoiceChat:
         if self.stt:
             await self.stt.astart()
 
-        if self.interruption_observer:
-            await self.interruption_observer.astart()
+        if self.interruption_observer is None or self.interruption_observer.done():
+            self.interruption_observer = asyncio.create_task(
+                self._aobserve_interruption()
+            )
 
     async def astop(self):
         """音声対話システムの全コンポーネントを停止し、リソースを解放します。
@@ -269,43 +375,81 @@ class FastVoiceChat:
             "Stopping AsyncFastVoiceChat components and releasing resources..."
         )
 
-        # 各コンポーネントの停止
-        if self.stt:
-            await self.stt.astop()
+        # 停止後に本回答の生成が始まらないよう、先に投機的な開始処理を中止
+        await self._aguard("Speculative Answer", self._acancel_speculative_answer())
+
+        # 各コンポーネントの停止（互いに独立しているため並行して実行）
+        async with asyncio.TaskGroup() as tg:
+            if self.stt:
+                tg.create_task(self._aguard("STT", self.stt.astop()))
 
-        if self.interruption_observer:
-            await self.interruption_observer.astop()
+            if self.interruption_observer:
+                tg.create_task(
+                    self._aguard("Observer", self._astop_interruption_observer())
+                )
+
+            if self.llm_backchannel:
+                tg.create_task(
+                    self._aguard("LLM Backchannel", self.llm_backchannel.astop_all())
+                )
 
-        if self.llm_backchannel:
-            await self.llm_backchannel.astop_all()
-            await self.llm_backchannel.acancel_all()
+            if self.llm_answer:
+                tg.create_task(self._aguard("LLM Answer", self.llm_answer.astop_all()))
 
-        if self.llm_answer:
-            await self.llm_answer.astop_all()
-            await self.llm_answer.acancel_all()
+            if self.tts:
+                tg.create_task(self._aguard("TTS", self.tts.astop()))
 
-        if self.tts:
-            await self.tts.astop()
+        # リソースの解放（LLMのacloseは残ったタスクのキャンセルも行う）
+        async with asyncio.TaskGroup() as tg:
+            if self.tts:
+                tg.create_task(self._aguard("TTS", self.tts.aclose()))
 
-        # リソースの解放
-        if self.tts:
-            await self.tts.aclose()
+            if self.llm_backchannel:
+                tg.create_task(
+                    self._aguard("LLM Backchannel", self.llm_backchannel.aclose())
+                )
 
-        # LLMのクライアントを解放
-        if self.llm_backchannel:
-            await self.llm_backchannel.aclose()
+            if self.llm_answer:
+                tg.create_task(self._aguard("LLM Answer", self.llm_answer.aclose()))
 
-        if self.llm_answer:
-            await self.llm_answer.aclose()
+        if self._finalizer is not None:
+            self._finalizer.detach()
 
         self._running = False
         logging.debug("AsyncFastVoiceChat components stopped and resources released")
 
+    async def __aenter__(self) -> Self:
+        await self.astart()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.astop()
+
+    @staticmethod
+    async def _aguard(name: str, coro: Awaitable[Any]):
+        """停止処理を実行し、失敗しても他の停止処理を巻き込まないよう例外をログに留める"""
+        try:
+            await coro
+        except Exception as e:
+            logging.error(f"[{name}]: error while stopping: {e}")
+
+    async def _astop_interruption_observer(self):
+        """割り込み検出タスクを停止"""
+        if self.interruption_observer is None:
+            return
+
+        self.interruption_observer.cancel()
+        try:
+            await self.interruption_observer
+        except asyncio.CancelledError:
+            pass
+        self.interruption_observer = None
+
     def stop(self):
         """同期版のstopメソッド"""
         # 既存のasyncioイベントループがあるかチェック
         try:
-            loop = asyncio.get_running_loop()
+            asyncio.get_running_loop()
             already_running = True
         except RuntimeError:
             already_running = False
@@ -316,29 +460,171 @@ class FastVoiceChat:
                 "stop は既存の asyncio イベントループの中から呼び出せません。"
                 "非同期コンテキスト内からは astop を直接使用してください。"
             )
-        else:
-            # 共有イベントループを使用
-            if (
-                hasattr(FastVoiceChat, "_shared_loop")
-                and not FastVoiceChat._shared_loop.is_closed()
-            ):
-                loop = FastVoiceChat._shared_loop
-                loop.run_until_complete(self.astop())
+
+        _run_in_background_loop(self.astop())
+
+    async def _aobserve_interruption(self):
+        """ユーザの発話開始とTTSの再生が重なったことを検出します。
+
+        STTとTTSの状態遷移イベントを待つだけで、ポーリングは行いません。
+        割り込みを許可している場合は`interrupt_event`をセットします。
+        """
+        while True:
+            await self.tts.playing_started_event.wait()
+            await self.stt.speech_started_event.wait()
+
+            # 発話開始を待つ間に再生が終わっていれば割り込みではない
+            if not self.tts.playing_started_event.is_set():
+                continue
+
+            if self.allow_interrupt:
+                self.interrupt_event.set()
+                logging.info("[Observer]: interruption detected.")
             else:
-                # 共有ループがない場合は一時的なループを作成
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                try:
-                    loop.run_until_complete(self.astop())
-                finally:
-                    # 一時的なループは閉じる
-                    loop.close()
+                logging.info("[Observer]: interruption detected, but not allowed.")
+
+            # 同じ再生に対して重複して検出しないよう再生終了まで待機
+            await self.tts.playing_ended_event.wait()
+
+    def _is_too_short(self, user_input: str) -> bool:
+        """LLMで生成を行うには短すぎる入力かを判定"""
+        return len(user_input.strip()) < self.min_input_length
+
+    def _is_backchannel_input_changed(self, user_input: str) -> bool:
+        """相槌生成をやり直すほど途中結果が変化したかを判定
+
+        前回生成を開始した入力から一定文字数以上増えたか、
+        一定時間以上経過した場合に変化したとみなします。
+
+        Args:
+            user_input: 音声認識の途中結果
+
+        Returns:
+            bool: 相槌生成を開始すべきならTrue
+        """
+        delta = len(user_input) - len(self._last_backchannel_input)
+        elapsed = time.monotonic() - self._last_backchannel_time
+        return (
+            delta >= self.backchannel_min_delta_chars
+            or elapsed >= self.backchannel_debounce_interval
+        )
+
+    async def _astart_backchannel(self, user_input: str):
+        """相槌の生成を開始します。
+
+        キャッシュに類似した入力があればAPIを呼ばずにその相槌を使用します。
+
+        Args:
+            user_input: 相槌生成の対象となるユーザー入力
+        """
+        self._last_backchannel_input = user_input
+        self._last_backchannel_time = time.monotonic()
+
+        cached_answer = None
+        if self.backchannel_cache is not None:
+            cached_answer = self.backchannel_cache.get(user_input)
+
+        # キャッシュから取り出した相槌は登録し直さない（重複したエントリが増えないように）
+        progress_callback = self._create_backchannel_progress_callback(
+            user_input, cache_answer=cached_answer is None
+        )
+
+        if cached_answer is not None:
+            # 類似した入力の相槌を再利用してAPI呼び出しを省略
+            logging.info(
+                f"[STT]: backchannel cache hit: {user_input} -> {cached_answer}"
+            )
+            await self.llm_backchannel.aput_answer(user_input, cached_answer)
+            await progress_callback(cached_answer)
+        else:
+            logging.info(f"[STT]: generation start: {user_input}")
+            await self.llm_backchannel.astart_generate_task(
+                user_input, progress_callback=progress_callback
+            )
+
+    def _create_backchannel_progress_callback(
+        self, user_input: str, cache_answer: bool = True
+    ) -> Callable[[str], Awaitable[None]]:
+        """相槌の最初のチャンクを受けて処理を行うコールバックを作成
+
+        相槌をキャッシュに登録したうえで、本回答の生成を投機的に開始します。
+        発話終了を待たずに本回答の生成を始めておき、発話終了時には
+        認識結果が一致するかを確認するだけで済むようにします。
+
+        Args:
+            user_input: 相槌生成の対象となったユーザー入力
+            cache_answer: 相槌をキャッシュに登録するかどうか
+
+        Returns:
+            Callable[[str], Awaitable[None]]: 相槌生成の進捗コールバック
+        """
+        started = False
+
+        async def astart_speculative_answer(backchannel_answer: str):
+            nonlocal started
+            if started:
+                return
+            started = True
+
+            if cache_answer and self.backchannel_cache is not None:
+                self.backchannel_cache.put(user_input, backchannel_answer)
+
+            # 相槌の生成を待たせないよう、本回答の開始は別タスクで行う
+            previous = self._speculative_answer_task
+            if previous is not None and not previous.done():
+                previous.cancel()
+            self._speculative_answer_task = asyncio.create_task(
+                self._astart_speculative_answer(user_input, backchannel_answer)
+            )
+
+        return astart_speculative_answer
+
+    async def _astart_speculative_answer(
+        self, user_input: str, backchannel_answer: str
+    ) -> None:
+        """本回答の生成を投機的に開始
+
+        Args:
+            user_input: 相槌生成の対象となったユーザー入力
+            backchannel_answer: 生成された相槌
+        """
+        # 古い入力に対する投機的な回答は不要なので破棄してから開始
+        await self.llm_answer.areset()
+        await self.llm_answer.astart_generate_task(
+            user_input, additional_messages=[("assistant", backchannel_answer)]
+        )
+
+    async def _await_speculative_answer(self) -> None:
+        """投機的な本回答の開始処理が終わるまで待機"""
+        # 待機中に新しい相槌で開始し直された場合は、そちらも待つ
+        while (task := self._speculative_answer_task) is not None and not task.done():
+            try:
+                await task
+            except asyncio.CancelledError:
+                # 待機している側がキャンセルされた場合は伝播させる
+                current_task = asyncio.current_task()
+                if current_task is not None and current_task.cancelling():
+                    raise
+            except Exception as e:
+                logging.error(f"Error in speculative answer: {e}")
+
+    async def _acancel_speculative_answer(self) -> None:
+        """投機的な本回答の開始処理を中止"""
+        task, self._speculative_answer_task = self._speculative_answer_task, None
+        if task is None or task.done():
+            return
+
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
 
     async def aplay_voice(
         self,
         text: str,
-        pause_stt: bool = True,
-        restart_stt: bool = True,
+        pause_stt: Optional[bool] = None,
+        restart_stt: Optional[bool] = None,
         interrupt_event: Optional[asyncio.Event] = None,
     ) -> bool:
         """テキストを音声に変換して再生します。
@@ -349,8 +635,10 @@ class FastVoiceChat:
 
         Args:
             text (str): 読み上げるテキスト
-            pause_stt (bool, optional): 音声認識を一時停止するかどうか。デフォルトはTrue
-            restart_stt (bool, optional): 再生後に音声認識を再開するかどうか。デフォルトはTrue
+            pause_stt (bool, optional): 音声認識を一時停止するかどうか。
+                Noneの場合は`pause_stt_during_playback`に従います
+            restart_stt (bool, optional): 再生後に音声認識を再開するかどうか。
+                Noneの場合は`pause_stt_during_playback`に従います
             interrupt_event (asyncio.Event, optional): 再生を中断するためのイベント。
                 Noneの場合はデフォルトのinterrupt_eventが使用されます。
 
@@ -378,6 +666,11 @@ class FastVoiceChat:
             logging.error("TTS not initialized")
             return False
 
+        if pause_stt is None:
+            pause_stt = self.pause_stt_during_playback
+        if restart_stt is None:
+            restart_stt = self.pause_stt_during_playback
+
         # 音声認識の一時停止
         if pause_stt and self.stt and self.stt.recognition:
             await self.stt.recognition.apause()
@@ -391,6 +684,128 @@ class FastVoiceChat:
 
         return result
 
+    async def _aplay_interruptible(self, play: Awaitable[bool]) -> bool:
+        """割り込みがあれば再生タスクそのものをキャンセルして再生します。
+
+        プレイヤー内部のポーリングで割り込みを検出するのを待たず、
+        `interrupt_event`がセットされた時点で再生タスクをキャンセルします。
+
+        Args:
+            play (Awaitable[bool]): 再生を行うコルーチン
+
+        Returns:
+            bool: 再生が完了したかどうか（Falseなら中断された）
+        """
+        play_task = asyncio.ensure_future(play)
+        interrupt_task = asyncio.create_task(self.interrupt_event.wait())
+        try:
+            await asyncio.wait(
+                {play_task, interrupt_task}, return_when=asyncio.FIRST_COMPLETED
+            )
+        finally:
+            interrupt_task.cancel()
+            if not play_task.done():
+                play_task.cancel()
+
+        try:
+            return await play_task
+        except asyncio.CancelledError:
+            # 呼び出し元自体がキャンセルされた場合は伝播させる
+            current_task = asyncio.current_task()
+            if current_task is not None and current_task.cancelling():
+                raise
+            return False
+
+    async def _aplay_answer(self, backchannel_answer: str, first_answer: str) -> str:
+        """本回答を文単位で音声合成しながら順に再生します。
+
+        回答チャンクが届き次第、前のチャンクの再生を待たずに音声合成を開始し、
+        再生は合成タスクをキューに積んだ順（FIFO）に行います。
+        割り込みで再生を打ち切った場合、未再生の合成タスクはキャンセルします。
+
+        Args:
+            backchannel_answer (str): 直前に再生した相槌（ログ出力用）
+            first_answer (str): 回答キューから取り出し済みの最初の回答チャンク
+
+        Returns:
+            str: 再生し終えた本回答
+        """
+        synthesis_queue: asyncio.Queue[Optional[Tuple[str, asyncio.Task]]] = (
+            asyncio.Queue()
+        )
+
+        def enqueue(chunk: str) -> bool:
+            # "NA"はスキップフラグ
+            if chunk == "NA":
+                logging.info(
+                    f"[LLM Answer]: {self.llm_answer.previous_user_input} -> {backchannel_answer} -> {chunk}"
+                )
+                return False
+
+            task = asyncio.create_task(self.tts.asynthesize(chunk))
+            synthesis_queue.put_nowait((chunk, task))
+            return True
+
+        async def aproduce():
+            try:
+                if not enqueue(first_answer):
+                    return
+
+                async for chunk in self.llm_answer.aiter_answer():
+                    if not enqueue(chunk):
+                        break
+            finally:
+                synthesis_queue.put_nowait(None)
+
+        producer = asyncio.create_task(aproduce())
+        detail_full_answer = ""
+
+        try:
+            while (item := await synthesis_queue.get()) is not None:
+                # 割り込みがあった場合は処理を中断
+                if self.interrupt_event.is_set() and self.allow_interrupt:
+                    logging.info("[LLM Answer]: Interrupted during answer synthesis")
+                    break
+
+                detail_answer, synthesis_task = item
+                logging.info(
+                    f"[LLM Answer]: {self.llm_answer.previous_user_input} -> {backchannel_answer} -> {detail_answer}"
+                )
+
+                try:
+                    content = await synthesis_task
+                except Exception as e:
+                    logging.error(f"[TTS]: synthesis failed: {e}")
+                    continue
+
+                # 応答チャンクを再生
+                await self._aplay_interruptible(
+                    self.tts.aplay_content(
+                        content, interrupt_event=self.interrupt_event
+                    )
+                )
+
+                # 割り込みがあれば中断
+                if self.interrupt_event.is_set() and self.allow_interrupt:
+                    logging.info("[TTS]: stop due to user interruption")
+                    break
+
+                detail_full_answer += detail_answer
+        finally:
+            producer.cancel()
+            try:
+                await producer
+            except asyncio.CancelledError:
+                pass
+
+            # 再生しなかった合成タスクを破棄
+            while not synthesis_queue.empty():
+                item = synthesis_queue.get_nowait()
+                if item is not None:
+                    item[1].cancel()
+
+        return detail_full_answer
+
     async def autter_after_listening(
         self, *, add_history: bool = True, additional_utterance: str = ""
     ) -> List[Tuple[str, str]]:
@@ -417,10 +832,15 @@ class FastVoiceChat:
         # 割り込みイベントをクリア
         self.interrupt_event.clear()
 
-        # 処理の重複を防ぐためのロック取得
-        async with self.processing_lock:
-            # 相槌処理
-            backchannel_text = self.llm_backchannel.previous_user_input
+        # 間引きで取りこぼした相槌の生成を補う
+        speech_text = self.stt.text
+        if self.llm_backchannel.answer_queue.empty() and (
+            self.llm_backchannel.should_generate(speech_text)
+        ):
+            await self._astart_backchannel(speech_text)
+
+        # 相槌処理
+        backchannel_text = self.llm_backchannel.previous_user_input
 
         # 相槌キューが空なら少し待機
         while self.llm_backchannel.answer_queue.empty():
@@ -431,90 +851,88 @@ class FastVoiceChat:
         logging.info(f"[LLM Backchannel]: {backchannel_text} -> {backchannel_answer}")
 
         # 相槌再生前に音声認識を一時停止
-        await self.stt.recognition.apause()
+        if self.pause_stt_during_playback:
+            await self.stt.recognition.apause()
 
-        async with self.processing_lock:
-            user_input = self.stt.recognition.text
+        user_input = self.stt.recognition.text
 
         additional_messages = None
         if backchannel_answer:
             additional_messages = [("assistant", backchannel_answer)]
 
-        # 本回答の生成を開始
-        if self.llm_answer.should_generate(user_input):
+        # 投機的な本回答の開始処理が途中なら、その結果を見てから判断する
+        await self._await_speculative_answer()
+
+        # 短すぎる入力には有用な本回答が期待できないため生成しない
+        expects_answer = not self._is_too_short(user_input)
+        if not expects_answer:
+            await self.llm_answer.areset()
+        # 投機的に開始済みの本回答が最終的な認識結果と一致しなければ生成し直す
+        elif user_input not in (
+            self.llm_answer.previous_user_input,
+            self.llm_answer.latest_user_input,
+        ):
+            await self.llm_answer.areset()
             await self.llm_answer.astart_generate_task(
                 user_input, additional_messages=additional_messages
             )
 
         # 相槌の再生
-        await self.tts.aplay_voice(
-            backchannel_answer,
-            interrupt_event=self.interrupt_event,
+        await self._aplay_interruptible(
+            self.tts.aplay_voice(
+                backchannel_answer,
+                interrupt_event=self.interrupt_event,
+            )
         )
 
+        # 追加発話の音声合成を本回答の再生と並行して進めておく
+        additional_task: Optional[asyncio.Task] = None
+        if additional_utterance:
+            additional_task = asyncio.create_task(
+                self.tts.asynthesize(additional_utterance)
+            )
+
         # 本回答の生成を一定時間待機
         wait_timeout = 2  # 待機タイムアウト（秒）
-        wait_start = time.time()
-        while self.llm_answer.answer_queue.empty():
-            if time.time() - wait_start > wait_timeout:
+        first_answer: Optional[str] = None
+        if expects_answer:
+            try:
+                first_answer = await asyncio.wait_for(
+                    self.llm_answer.answer_queue.get(), timeout=wait_timeout
+                )
+            except asyncio.TimeoutError:
                 logging.debug("[LLM Answer]: Timed out waiting for answer")
-                break
-            await asyncio.sleep(0.1)
 
         # 割り込みイベントをクリア
         self.interrupt_event.clear()
 
         # 本回答の再生
-        detail_answer = ""
         detail_full_answer = ""
-
-        while not self.llm_answer.answer_queue.empty():
-            # 割り込みがあった場合は処理を中断
-            if self.interrupt_event.is_set() and self.allow_interrupt:
-                logging.info("[LLM Answer]: Interrupted during answer synthesis")
-                break
-
-            # 回答チャンクを取得
-            detail_answer = await self.llm_answer.answer_queue.get()
-
-            # "NA"はスキップフラグ
-            if detail_answer == "NA":
-                logging.info(
-                    f"[LLM Answer]: {self.llm_answer.previous_user_input} -> {backchannel_answer} -> {detail_answer}"
-                )
-                break
-
-            logging.info(
-                f"[LLM Answer]: {self.llm_answer.previous_user_input} -> {backchannel_answer} -> {detail_answer}"
-            )
-
-            # 応答チャンクを再生
-            await self.tts.aplay_voice(
-                detail_answer,
-                interrupt_event=self.interrupt_event,
+        if first_answer is not None:
+            detail_full_answer = await self._aplay_answer(
+                backchannel_answer, first_answer
             )
 
-            # 割り込みがあれば中断
-            if self.interrupt_event.is_set() and self.allow_interrupt:
-                logging.info("[TTS]: stop due to user interruption")
-                break
-
-            detail_full_answer += detail_answer
-
         # 追加発話があれば再生
         uttered_additional_utterance = ""
-        if additional_utterance:
-            await self.tts.aplay_voice(
-                additional_utterance,
-                interrupt_event=self.interrupt_event,
-            )
+        if additional_task is not None:
+            try:
+                additional_content = await additional_task
+            except Exception as e:
+                logging.error(f"[TTS]: synthesis failed: {e}")
+            else:
+                await self._aplay_interruptible(
+                    self.tts.aplay_content(
+                        additional_content,
+                        interrupt_event=self.interrupt_event,
+                    )
+                )
 
-            if not (self.interrupt_event.is_set() and self.allow_interrupt):
-                uttered_additional_utterance = additional_utterance
+                if not (self.interrupt_event.is_set() and self.allow_interrupt):
+                    uttered_additional_utterance = additional_utterance
 
         # 会話履歴の作成
-        async with self.processing_lock:
-            previous_user_input = self.llm_backchannel.previous_user_input
+        previous_user_input = self.llm_backchannel.previous_user_input
 
         new_history = [
             ("user", previous_user_input),
@@ -529,13 +947,14 @@ class FastVoiceChat:
 
         # 会話履歴の更新
         if add_history:
-            await self.llm_backchannel.aadd_history(new_history)
-            await self.llm_answer.aadd_history(new_history)
+            await self.history.aextend(new_history)
 
+        await self._acancel_speculative_answer()
         await self.llm_backchannel.areset()
         await self.llm_answer.areset()
         await self.stt.recognition.astart_new_session()
         self.interrupt_event.clear()
+        self._last_backchannel_input = ""
 
         return new_history
 
@@ -557,7 +976,7 @@ class FastVoiceChat:
         """
         # 既存のasyncioイベントループがあるかチェック
         try:
-            loop = asyncio.get_running_loop()
+            asyncio.get_running_loop()
             already_running = True
         except RuntimeError:
             already_running = False
@@ -568,52 +987,15 @@ class FastVoiceChat:
                 "utter_after_listening は既存の asyncio イベントループの中から呼び出せません。"
                 "非同期コンテキスト内からは utter_after_listening を直接使用してください。"
             )
-        else:
-            # クラス変数として保持している単一のイベントループを使用または作成
-            if not hasattr(FastVoiceChat, "_shared_loop"):
-                FastVoiceChat._shared_loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(FastVoiceChat._shared_loop)
 
-            loop = FastVoiceChat._shared_loop
-
-            # 前回の実行でイベントループが閉じられていたら再作成
-            if loop.is_closed():
-                FastVoiceChat._shared_loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(FastVoiceChat._shared_loop)
-                loop = FastVoiceChat._shared_loop
-
-            try:
-                # 非同期関数を実行
-                return loop.run_until_complete(
-                    self.autter_after_listening(
-                        add_history=add_history,
-                        additional_utterance=additional_utterance,
-                    )
+        try:
+            return _run_in_background_loop(
+                self.autter_after_listening(
+                    add_history=add_history,
+                    additional_utterance=additional_utterance,
                 )
-            except Exception as e:
-                logging.error(f"Error in utter_after_listening: {e}")
-                logging.error(traceback.format_exc())
-                # エラーが発生した場合でもイベントループは閉じない
-                return []
-
-    def __del__(self):
-        """オブジェクトが破棄されるときにリソースを解放"""
-        if self._initialized:
-            try:
-                # 既存のasyncioイベントループがあるかチェック
-                try:
-                    asyncio.get_running_loop()
-                    already_running = True
-                except RuntimeError:
-                    already_running = False
-
-                if (
-                    not already_running
-                    and hasattr(FastVoiceChat, "_shared_loop")
-                    and not FastVoiceChat._shared_loop.is_closed()
-                ):
-                    # 共有ループを使用してリソースを解放
-                    FastVoiceChat._shared_loop.run_until_complete(self.astop())
-            except Exception as e:
-                logging.error(f"Error in __del__: {e}")
-                # デストラクタ内のエラーは無視
+            )
+        except Exception as e:
+            logging.error(f"Error in utter_after_listening: {e}")
+            logging.error(traceback.format_exc())
+            return []
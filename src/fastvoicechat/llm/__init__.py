@@ -1,3 +1,12 @@
+from .cache import SemanticCache
+from .history import ConversationHistory
 from .llm import LLM
+from .worker import InferenceWorker, get_inference_worker
 
-__all__ = ["LLM"]
+__all__ = [
+    "LLM",
+    "SemanticCache",
+    "ConversationHistory",
+    "InferenceWorker",
+    "get_inference_worker",
+]
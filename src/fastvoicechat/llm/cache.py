@@ -0,0 +1,106 @@
+import zlib
+from typing import List, Optional
+
+import numpy as np
+
+
+class SemanticCache:
+    """
+    意味的に近い入力に対して過去の回答を再利用するキャッシュ
+
+    入力テキストを文字n-gramのハッシュベクトルに変換し、
+    コサイン類似度が閾値以上のエントリがあればその回答を返します。
+    容量を超えた場合は参照回数が最も少ないエントリ（LFU）から削除します。
+    """
+
+    def __init__(
+        self,
+        *,
+        max_size: int = 32,
+        threshold: float = 0.92,
+        ngram: int = 2,
+        dim: int = 512,
+    ):
+        """
+        Args:
+            max_size: 保持するエントリの最大数
+            threshold: キャッシュヒットとみなすコサイン類似度の閾値
+            ngram: ベクトル化に用いる文字n-gramの長さ
+            dim: ハッシュベクトルの次元数
+        """
+        self.max_size = max_size
+        self.threshold = threshold
+        self.ngram = ngram
+        self.dim = dim
+        self._embeddings = np.zeros((max_size, dim), dtype=np.float32)
+        self._answers: List[str] = []
+        self._hits: List[int] = []
+
+    def _embed(self, text: str) -> np.ndarray:
+        """テキストを正規化済みの文字n-gramハッシュベクトルに変換"""
+        vector = np.zeros(self.dim, dtype=np.float32)
+        if len(text) < self.ngram:
+            grams = [text]
+        else:
+            grams = [
+                text[i : i + self.ngram] for i in range(len(text) - self.ngram + 1)
+            ]
+        for gram in grams:
+            vector[zlib.crc32(gram.encode("utf-8")) % self.dim] += 1.0
+
+        norm = np.linalg.norm(vector)
+        if norm > 0:
+            vector /= norm
+        return vector
+
+    def get(self, text: str) -> Optional[str]:
+        """
+        類似した入力に対する回答を取得
+
+        Args:
+            text: 入力テキスト
+
+        Returns:
+            Optional[str]: キャッシュされた回答。ヒットしなければNone
+        """
+        if not text or not self._answers:
+            return None
+
+        similarities = self._embeddings[: len(self._answers)] @ self._embed(text)
+        index = int(np.argmax(similarities))
+        if similarities[index] < self.threshold:
+            return None
+
+        self._hits[index] += 1
+        return self._answers[index]
+
+    def put(self, text: str, answer: str) -> None:
+        """
+        入力と回答の組を追加
+
+        Args:
+            text: 入力テキスト
+            answer: 回答
+        """
+        if not text or not answer or self.max_size <= 0:
+            return
+
+        if len(self._answers) < self.max_size:
+            index = len(self._answers)
+            self._answers.append(answer)
+            self._hits.append(0)
+        else:
+            # 参照回数が最も少ないエントリを置き換える
+            index = int(np.argmin(self._hits))
+            self._answers[index] = answer
+            self._hits[index] = 0
+
+        self._embeddings[index] = self._embed(text)
+
+    def clear(self) -> None:
+        """キャッシュを空にする"""
+        self._answers.clear()
+        self._hits.clear()
+
+    def __len__(self) -> int:
+        return len(self._answers)
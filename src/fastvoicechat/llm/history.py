@@ -0,0 +1,74 @@
+from typing import Dict, Iterable, Optional, Tuple
+
+
+class ConversationHistory:
+    """
+    複数のLLMで共有する確定済みの会話履歴
+
+    履歴は追記のみ行い、既存の要素は変更しません。
+    共有しているLLMはプロンプト作成時に同じ履歴を参照するため、
+    ターンごとの履歴の追加は1回で済み、各LLMのプロンプトの先頭部分も一致します。
+    APIに送るメッセージ形式への変換も追加時に1回だけ行い、共有するLLM間で使い回します。
+    """
+
+    def __init__(self, messages: Iterable[Tuple[str, str]] = ()):
+        """
+        Args:
+            messages: 初期の会話履歴（(role, content)形式のタプル）
+        """
+        self._messages: Tuple[Tuple[str, str], ...] = tuple(messages)
+        self._message_dicts: Tuple[Dict[str, str], ...] = self._to_dicts(self._messages)
+
+    @staticmethod
+    def _to_dicts(
+        messages: Tuple[Tuple[str, str], ...],
+    ) -> Tuple[Dict[str, str], ...]:
+        """(role, content)形式のタプルをAPIに送るメッセージ形式に変換"""
+        return tuple({"role": role, "content": content} for role, content in messages)
+
+    @property
+    def messages(self) -> Tuple[Tuple[str, str], ...]:
+        """(role, content)形式の会話履歴"""
+        return self._messages
+
+    @property
+    def message_dicts(self) -> Tuple[Dict[str, str], ...]:
+        """APIに送るメッセージ形式の会話履歴（変更しないこと）"""
+        return self._message_dicts
+
+    def window_dicts(self, max_messages: Optional[int]) -> Tuple[Dict[str, str], ...]:
+        """
+        直近の会話履歴をAPIに送るメッセージ形式で取得
+
+        上限を超えた分は`max_messages // 2`件単位で古い方から切り捨てます。
+        1件ずつずらすとターンごとにプロンプトの先頭部分が変わってしまうため、
+        切り捨て位置は一定件数ごとにしか動かないようにしています。
+
+        Args:
+            max_messages: 取得する最大件数。Noneの場合はすべて
+
+        Returns:
+            Tuple[Dict[str, str], ...]: メッセージ形式の会話履歴
+        """
+        if max_messages is None or len(self._message_dicts) <= max_messages:
+            return self._message_dicts
+
+        overflow = len(self._message_dicts) - max_messages
+
+        step = max(max_messages // 2, 1)
+        start = -(-overflow // step) * step
+        return self._message_dicts[start:]
+
+    async def aextend(self, messages: Iterable[Tuple[str, str]]) -> None:
+        """
+        会話履歴に追加
+
+        Args:
+            messages: 追加する会話履歴
+        """
+        new_messages = tuple(messages)
+        self._messages += new_messages
+        self._message_dicts += self._to_dicts(new_messages)
+
+    def __len__(self) -> int:
+        return len(self._messages)
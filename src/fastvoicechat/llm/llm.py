@@ -1,14 +1,33 @@
 import asyncio
 import logging
+import re
 import signal
 import sys
 import time
 import traceback
+from collections import deque
+from contextlib import aclosing
 from dataclasses import dataclass
-from typing import Any, AsyncGenerator, Callable, Dict, List, Optional, Tuple
+from typing import (
+    Any,
+    AsyncGenerator,
+    Callable,
+    Deque,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+)
 
 from openai import AsyncOpenAI
 
+from fastvoicechat.base import is_blocking
+from fastvoicechat.llm.history import ConversationHistory
+from fastvoicechat.llm.worker import InferenceWorker, get_inference_worker
+
+# キャンセルしたタスクの終了を待つ最大時間（秒）
+CANCEL_TIMEOUT = 0.5
+
 
 @dataclass
 class TaskInfo:
@@ -34,15 +53,34 @@ class LLM:
         model: str = "gpt-4o-mini",
         system_prompt: str = "",
         separator: str = "。！？!?",
+        max_chunk_length: int = 80,
+        worker: Optional[InferenceWorker] = None,
+        history: Optional[ConversationHistory] = None,
+        history_window: Optional[int] = 24,
+        max_queue_size: int = 0,
     ):
         self.model = model
         self.system_prompt = system_prompt
-        self.client = AsyncOpenAI()
+        # Noneの場合は実行中のイベントループで共有されるワーカーを使用
+        self._worker = worker
+        self._owns_worker_ref = False
+        # 状態はイベントループのスレッドからのみ更新するため、ロックは使わない
         self._state: Dict[str, Any] = {}
-        self.answer_queue = asyncio.Queue()
-        self.tasks: List[TaskInfo] = []
+        # should_generateで直前に却下した入力（タスクや前回入力の変化で無効化）
+        self._last_rejected_input: Optional[str] = None
+        # 確定済みの会話履歴。他のLLMと共有する場合は同じインスタンスを渡す
+        self.conversation_history = (
+            history if history is not None else ConversationHistory()
+        )
+        # プロンプトに含める履歴の最大件数（Noneの場合はすべて）
+        self.history_window = history_window
+        # max_queue_sizeを指定した場合のみ、上限を超えたら古いチャンクから捨てる
+        # （_put_answerを参照）。0の場合は上限なし
+        self.answer_queue: asyncio.Queue[str] = asyncio.Queue(maxsize=max_queue_size)
+        # 開始時刻順に並んだタスク（追加は常に末尾なので並びが保たれる）
+        self.tasks: Deque[TaskInfo] = deque()
         self.separator = separator
-        self._lock = asyncio.Lock()
+        self.max_chunk_length = max_chunk_length
 
     def should_generate(self, user_input: str) -> bool:
         """
@@ -57,20 +95,47 @@ class LLM:
         if not user_input:
             return False
 
-        if user_input and not self.tasks:
-            return True
+        # 音声認識の途中結果は同じテキストが続けて届くため、直前に却下した入力は比較を省く
+        if user_input == self._last_rejected_input:
+            return False
 
         if self.tasks:
             latest_task = self.tasks[-1]
             if not latest_task.task.done() and latest_task.user_input == user_input:
+                self._last_rejected_input = user_input
                 return False
 
         previous_user_input = self.previous_user_input
         if user_input == previous_user_input:
+            self._last_rejected_input = user_input
             return False
 
         return True
 
+    def _set_previous_user_input(self, user_input: str):
+        """前回のユーザー入力を更新（判定結果が変わりうるため却下済みの入力も忘れる）"""
+        self._state["previous_user_input"] = user_input
+        self._last_rejected_input = None
+
+    def _old_tasks(self, current_time: float) -> List[TaskInfo]:
+        """
+        指定した時間より前に開始されたタスクを取得
+
+        タスクは開始時刻順に並んでいるため、基準時刻以降のタスクに達した時点で走査を打ち切ります。
+
+        Args:
+            current_time: 基準となる時間
+
+        Returns:
+            List[TaskInfo]: 該当するタスク
+        """
+        old_tasks = []
+        for task_info in self.tasks:
+            if task_info.start_time >= current_time:
+                break
+            old_tasks.append(task_info)
+        return old_tasks
+
     async def astop_old_tasks(self, current_time: float):
         """
         指定した時間より前に開始されたタスクを停止
@@ -78,9 +143,8 @@ class LLM:
         Args:
             current_time: 基準となる時間
         """
-        for task_info in self.tasks:
-            if task_info.start_time < current_time:
-                task_info.stop_event.set()
+        for task_info in self._old_tasks(current_time):
+            task_info.stop_event.set()
 
     async def acancel_old_tasks(self, current_time: float):
         """
@@ -89,21 +153,105 @@ class LLM:
         Args:
             current_time: 基準となる時間
         """
+        # 待機中に新しいタスクが追加されても走査に影響しないよう、先に対象を確定する
+        to_await = []
+        for task_info in self._old_tasks(current_time):
+            task = task_info.task
+            if task.done():
+                continue
+            task_info.stop_event.set()
+            # 既にキャンセル要求済みのタスクには重ねて要求しない
+            if not task.cancelling():
+                task.cancel()
+            to_await.append(task)
+
+        await self._await_cancelled(to_await)
+
+    async def _await_cancelled(self, tasks: List[asyncio.Task]):
+        """
+        キャンセルしたタスクの終了を待機
+
+        既に終了したタスクは待たず、待機時間は`CANCEL_TIMEOUT`秒までに制限します。
+        キャンセル時の例外は送出しません。
+
+        Args:
+            tasks: キャンセルしたタスク
+        """
+        pending = {task for task in tasks if not task.done()}
+        if not pending:
+            return
+
+        _, not_finished = await asyncio.wait(pending, timeout=CANCEL_TIMEOUT)
+        if not_finished:
+            logging.warning(
+                f"[LLM]: {len(not_finished)} tasks did not finish "
+                f"within {CANCEL_TIMEOUT}s after cancel"
+            )
+
+    def _put_answer(self, chunk: str):
+        """
+        回答キューにチャンクを追加
+
+        待機せずに追加し、上限付きのキューが満杯の場合は最も古いチャンクを捨てます。
+        """
+        try:
+            self.answer_queue.put_nowait(chunk)
+        except asyncio.QueueFull:
+            self.answer_queue.get_nowait()
+            logging.warning("[LLM]: answer queue is full, dropped the oldest chunk")
+            self.answer_queue.put_nowait(chunk)
+
+    def _clear_answer_queue(self):
+        """
+        回答キューを空にする
+
+        要素を1つずつ取り出さず、キュー内部のdequeをまとめて空にします。
+        """
+        queue = self.answer_queue
+        queue._queue.clear()  # type: ignore[attr-defined]
+        queue._unfinished_tasks = 0  # type: ignore[attr-defined]
+        queue._finished.set()  # type: ignore[attr-defined]
+
+    async def _arotate_tasks(self, current_time: float):
+        """
+        指定した時間より前に開始されたタスクを1回の走査で停止・キャンセルし、終了を待機
+
+        astop_old_tasksとacancel_old_tasksをまとめたもので、
+        終了を待つタスクはまとめて待機します。終了したタスクは完了コールバックで一覧から外れます。
+
+        Args:
+            current_time: 基準となる時間
+        """
+        to_await = []
         for task_info in self.tasks:
-            if task_info.start_time < current_time:
-                if not task_info.task.done():
-                    task_info.stop_event.set()
-                    task_info.task.cancel()
-                    try:
-                        await task_info.task
-                    except asyncio.CancelledError:
-                        pass
+            if task_info.start_time >= current_time:
+                break
+            task_info.stop_event.set()
+            task = task_info.task
+            if not task.done():
+                if not task.cancelling():
+                    task.cancel()
+                to_await.append(task)
+
+        await self._await_cancelled(to_await)
+
+    def _remove_task(self, task_info: TaskInfo):
+        """終了したタスクを一覧から削除（タスクの完了コールバック）"""
+        try:
+            self.tasks.remove(task_info)
+        except ValueError:
+            pass
+        self._last_rejected_input = None
 
     async def acleanup_done_tasks(self):
-        """終了したタスクをリストから削除"""
-        self.tasks = [
+        """
+        終了したタスクを削除
+
+        終了したタスクは完了コールバックで自動的に削除されるため、通常は呼び出す必要はありません。
+        """
+        self.tasks = deque(
             task_info for task_info in self.tasks if not task_info.task.done()
-        ]
+        )
 
     async def _agenerate(
         self,
@@ -123,43 +271,46 @@ class LLM:
             生成されたテキストチャンク
         """
         # メッセージの準備
-        messages_tuple = []
-        if self.system_prompt:
-            messages_tuple.append(("system", self.system_prompt))
-
-        if "history" in self._state:
-            messages_tuple.extend(self._state["history"])
-
-        messages_tuple.append(("user", user_input))
-
+        # [システムプロンプト] → [確定済み履歴] → [ユーザー入力] → [追加メッセージ]の順に並べ、
+        # ターンをまたいで先頭部分が変わらないようにする
+        # 追加メッセージ（相槌）はユーザー入力への応答なのでユーザー入力の後に置く。
+        # ターン終了時には同じ並びのまま履歴に追加されるため、次のターンでも先頭部分は一致する
+        # システムプロンプトと履歴は変換済みのものを使い、リクエストごとには末尾のみ変換する
+        messages = [
+            *self._system_messages,
+            *self.conversation_history.window_dicts(self.history_window),
+            {"role": "user", "content": user_input},
+        ]
         if additional_messages:
-            messages_tuple.extend(additional_messages)
-
-        messages = self.tuples_to_messages(messages_tuple)
+            messages.extend(self.tuples_to_messages(additional_messages))
 
         # APIリクエスト
-        response = await self.client.chat.completions.create(
-            messages=messages,
-            model=self.model,
-            stream=True,
-        )
-
-        # レスポンス処理
         answer = ""
-        async for chunk in response:
-            if stop_event.is_set():
-                break
+        async with aclosing(self.worker.arun(self.model, messages)) as response:
+            # レスポンス処理
+            async for chunk in response:
+                if stop_event.is_set():
+                    break
 
-            content = chunk.choices[0].delta.content
-            if not content:
-                continue
+                content = chunk.choices[0].delta.content
+                if not content:
+                    continue
 
-            answer += content
+                answer += content
 
-            # 句点、！、？、!、?が見つかった場合、現在の文を返す
-            if content[-1] in self.separator:
-                yield answer
-                answer = ""
+                # 句点、！、？、!、?が見つかった場合、最後の区切り文字までを返す
+                # 1つのチャンクに区切り文字と次の文の先頭が含まれる場合は、残りを次の文に回す
+                match = self._separator_pattern and self._separator_pattern.match(
+                    content
+                )
+                if match:
+                    split = len(answer) - len(content) + match.end()
+                    yield answer[:split]
+                    answer = answer[split:]
+                # 区切りが来ないまま長くなった場合も、音声合成を待たせないよう返す
+                elif len(answer) >= self.max_chunk_length:
+                    yield answer
+                    answer = ""
 
         if answer:
             yield answer
@@ -181,12 +332,20 @@ class LLM:
             stop_event: 停止イベント
             start_time: 開始時間
             additional_messages: 追加メッセージ
-            progress_callback: 進捗コールバック
-            completion_callback: 完了時コールバック
+            progress_callback: 進捗コールバック。同期関数はイベントループ上で呼び出すため、
+                時間のかかる処理は:func:`fastvoicechat.mark_blocking`を付ける
+            completion_callback: 完了時コールバック（同期関数の扱いは進捗コールバックと同じ）
         """
         if additional_messages is None:
             additional_messages = []
 
+        # コールバックの種類はタスク中に変わらないため、チャンクごとではなく最初に判定する
+        loop = asyncio.get_running_loop()
+        progress_is_coro = asyncio.iscoroutinefunction(progress_callback)
+        progress_is_blocking = is_blocking(progress_callback)
+        completion_is_coro = asyncio.iscoroutinefunction(completion_callback)
+        completion_is_blocking = is_blocking(completion_callback)
+
         try:
             is_first = True
             answer = ""
@@ -199,41 +358,37 @@ class LLM:
 
                 # 進捗コールバックの呼び出し
                 if progress_callback:
-                    if asyncio.iscoroutinefunction(progress_callback):
+                    if progress_is_coro:
                         await progress_callback(chunk)
-                    else:
-                        loop = asyncio.get_running_loop()
+                    elif progress_is_blocking:
                         await loop.run_in_executor(None, progress_callback, chunk)
+                    else:
+                        # 軽い同期処理はスレッドに渡さずそのまま呼び出す
+                        progress_callback(chunk)
 
                 # 最初のチャンクが来たら古いタスクを停止
                 if is_first:
-                    await self.astop_old_tasks(start_time)
-                    await self.acancel_old_tasks(start_time)
-                    await self.acleanup_done_tasks()
+                    await self._arotate_tasks(start_time)
 
-                    async with self._lock:
-                        self._state["previous_user_input"] = user_input
+                    self._set_previous_user_input(user_input)
 
                     # 回答キューをクリア
-                    while not self.answer_queue.empty():
-                        try:
-                            self.answer_queue.get_nowait()
-                        except asyncio.QueueEmpty:
-                            break
+                    self._clear_answer_queue()
 
                     is_first = False
 
                 # 回答キューに追加
-                await self.answer_queue.put(chunk)
+                self._put_answer(chunk)
                 answer += chunk
 
             # 完了コールバックの呼び出し
             if completion_callback and not stop_event.is_set():
-                if asyncio.iscoroutinefunction(completion_callback):
+                if completion_is_coro:
                     await completion_callback(answer)
-                else:
-                    loop = asyncio.get_running_loop()
+                elif completion_is_blocking:
                     await loop.run_in_executor(None, completion_callback, answer)
+                else:
+                    completion_callback(answer)
 
         except Exception as e:
             logging.error(f"Error in generate: {e}")
@@ -258,7 +413,7 @@ class LLM:
         """
 
         stop_event = asyncio.Event()
-        start_time = time.time()
+        start_time = time.monotonic()
 
         # 非同期タスクを作成
         task = asyncio.create_task(
@@ -285,16 +440,123 @@ class LLM:
         )
 
         self.tasks.append(task_info)
+        self._last_rejected_input = None
+        self._state["latest_user_input"] = user_input
+        # 終了したタスクは自身で一覧から外れる
+        task.add_done_callback(lambda _, info=task_info: self._remove_task(info))
+
+    async def aput_answer(self, user_input: str, answer: str):
+        """
+        APIを呼ばずに回答を回答キューへ追加
+
+        キャッシュ済みの回答を使う場合など、生成結果の最初のチャンクが
+        届いたときと同様に古いタスクを停止してから回答を追加します。
+
+        Args:
+            user_input: ユーザー入力
+            answer: 回答
+        """
+        current_time = time.monotonic()
+        await self._arotate_tasks(current_time)
+
+        self._set_previous_user_input(user_input)
+
+        # 回答キューをクリア
+        self._clear_answer_queue()
+
+        self._put_answer(answer)
+
+    async def aiter_answer(self) -> AsyncGenerator[str, None]:
+        """
+        回答キューのチャンクを生成の完了まで順に返す
+
+        キューが空でも生成中のタスクがあれば次のチャンクを待ち、
+        すべてのタスクが終了してキューが空になった時点で終了します。
+
+        Yields:
+            生成されたテキストチャンク
+        """
+        while True:
+            if not self.answer_queue.empty():
+                yield self.answer_queue.get_nowait()
+                continue
+
+            pending = [
+                task_info.task for task_info in self.tasks if not task_info.task.done()
+            ]
+            if not pending:
+                return
+
+            getter = asyncio.ensure_future(self.answer_queue.get())
+            try:
+                await asyncio.wait(
+                    [getter, *pending], return_when=asyncio.FIRST_COMPLETED
+                )
+            finally:
+                if not getter.done():
+                    getter.cancel()
+
+            # 取得前にタスクが終了した場合、getterはキャンセル要求中で結果を持たない
+            if getter.done() and not getter.cancelled():
+                yield getter.result()
+
+    @property
+    def separator(self) -> str:
+        """文の区切りとみなす文字"""
+        return self._separator
+
+    @separator.setter
+    def separator(self, value: str) -> None:
+        self._separator = value
+        # チャンク内の最後の区切り文字までに一致する正規表現を事前にコンパイルしておく
+        self._separator_pattern: Optional[re.Pattern[str]] = (
+            re.compile(f"(?s).*[{re.escape(value)}]") if value else None
+        )
+
+    @property
+    def system_prompt(self) -> str:
+        """システムプロンプト"""
+        return self._system_prompt
+
+    @system_prompt.setter
+    def system_prompt(self, value: str) -> None:
+        self._system_prompt = value
+        # メッセージ形式への変換はここで1回だけ行う
+        # 変換済みのメッセージは全リクエストで共有するため、変更できないタプルで保持する
+        self._system_messages: Tuple[Dict[str, str], ...] = (
+            ({"role": "system", "content": value},) if value else ()
+        )
+
+    @property
+    def worker(self) -> InferenceWorker:
+        """推論に使用するワーカー"""
+        if self._worker is None:
+            self._worker = get_inference_worker()
+        if not self._owns_worker_ref:
+            # aclose時に解放するまでワーカーのクライアントを閉じさせない
+            self._worker.acquire()
+            self._owns_worker_ref = True
+        return self._worker
+
+    @property
+    def client(self) -> AsyncOpenAI:
+        """APIクライアント（ワーカーと共有）"""
+        return self.worker.client
 
     @property
     def previous_user_input(self) -> str:
         """前回のユーザー入力"""
         return self._state.get("previous_user_input", "")
 
+    @property
+    def latest_user_input(self) -> str:
+        """最後に生成を開始したユーザー入力"""
+        return self._state.get("latest_user_input", "")
+
     @property
     def history(self) -> List[Tuple[str, str]]:
         """会話履歴"""
-        return self._state.get("history", [])
+        return list(self.conversation_history.messages)
 
     async def aadd_history(self, value: List[Tuple[str, str]]) -> None:
         """
@@ -303,10 +565,7 @@ class LLM:
         Args:
             value: 追加する会話履歴
         """
-        async with self._lock:
-            if "history" not in self._state:
-                self._state["history"] = []
-            self._state["history"] += value
+        await self.conversation_history.aextend(value)
 
     def tuples_to_messages(self, value: List[Tuple[str, str]]) -> list:
         """
@@ -327,36 +586,38 @@ class LLM:
 
     async def acancel_all(self):
         """すべてのタスクをキャンセル"""
+        to_await = []
         for task_info in self.tasks:
             task_info.stop_event.set()
-            if not task_info.task.done():
-                task_info.task.cancel()
-                try:
-                    await task_info.task
-                except asyncio.CancelledError:
-                    pass
+            task = task_info.task
+            if not task.done():
+                if not task.cancelling():
+                    task.cancel()
+                to_await.append(task)
+
+        await self._await_cancelled(to_await)
 
     async def areset(self):
         """状態をリセット"""
-        await self.astop_all()
-        await self.acancel_all()
-        await self.acleanup_done_tasks()
+        await self._arotate_tasks(float("inf"))
 
-        async with self._lock:
-            self._state["previous_user_input"] = ""
+        self._set_previous_user_input("")
+        self._state["latest_user_input"] = ""
 
         # 回答キューをクリア
-        while not self.answer_queue.empty():
-            try:
-                self.answer_queue.get_nowait()
-            except asyncio.QueueEmpty:
-                break
+        self._clear_answer_queue()
 
     async def aclose(self):
-        """クライアントリソースを解放"""
+        """
+        リソースを解放
+
+        APIクライアントは他のLLMインスタンスと共有しているため、
+        最後の利用者が解放したときにだけ閉じられます。
+        """
         await self.areset()
-        if hasattr(self, "client") and self.client:
-            await self.client.close()
+        if self._worker is not None and self._owns_worker_ref:
+            self._owns_worker_ref = False
+            await self._worker.arelease()
 
 
 # AsyncSTTクラスをインポート（既存のファイルからインポートするように調整してください）
@@ -450,23 +711,18 @@ async def main():
                         user_input, additional_messages=additional_messages
                     )
 
-                # スレッド版と同様に少し待機（非同期版）
-                await asyncio.sleep(2)
-
                 # 本回答の取得と表示
+                # 一定時間待ってからキューを覗くのではなく、生成された文を届いた順に受け取る
                 detail_answer = ""
-                while not llm_answer.answer_queue.empty():
-                    chunk = await llm_answer.answer_queue.get()
+                async for chunk in llm_answer.aiter_answer():
                     detail_answer += chunk
                     logging.info(
                         f"[LLM Answer]: {llm_answer.previous_user_input} -> {detail_answer}"
                     )
-                    # 表示のためにわずかに待機
-                    await asyncio.sleep(2)
 
-                # 会話履歴の更新
+                # 会話履歴の更新（両LLMで共有しているため1回だけ追加する）
                 previous_user_input = llm_backchannel.previous_user_input
-                await llm_backchannel.aadd_history(
+                await history.aextend(
                     [
                         ("user", previous_user_input),
                         ("assistant", backchannel_answer),
@@ -474,19 +730,13 @@ async def main():
                     ]
                 )
 
-                await llm_answer.aadd_history(
-                    [
-                        ("user", previous_user_input),
-                        ("assistant", backchannel_answer),
-                        ("assistant", detail_answer),
-                    ]
+                # 状態のリセット（互いに独立しているため並行して行う）
+                await asyncio.gather(
+                    llm_backchannel.areset(),
+                    llm_answer.areset(),
+                    faststt.recognition.astart_new_session(),
                 )
 
-                # 状態のリセット
-                await llm_backchannel.areset()
-                await llm_answer.areset()
-                await faststt.recognition.astart_new_session()
-
     logging.info("非同期音声対話システムを初期化中...")
 
     # FastSTTの作成
@@ -504,9 +754,16 @@ async def main():
         "どのような相槌が適切か判断が難しい場合は「へー」「うーん」など無難な相槌を出力してください。"
     )
 
-    llm_backchannel = LLM(system_prompt=backchannel_system_prompt, model="gpt-4o-mini")
+    # 会話履歴は両LLMで共有する
+    history = ConversationHistory()
 
-    llm_answer = LLM(model="gpt-4o")
+    llm_backchannel = LLM(
+        system_prompt=backchannel_system_prompt,
+        model="gpt-4o-mini",
+        history=history,
+    )
+
+    llm_answer = LLM(model="gpt-4o", history=history)
 
     # システム開始
     await faststt.astart()
@@ -540,9 +797,11 @@ async def main():
 
     # 終了処理
     logging.info("システムを停止中...")
-    await faststt.astop()
-    await llm_backchannel.areset()
-    await llm_answer.areset()
+    await asyncio.gather(
+        faststt.astop(),
+        llm_backchannel.aclose(),
+        llm_answer.aclose(),
+    )
 
     logging.info("正常に終了しました")
     return 0
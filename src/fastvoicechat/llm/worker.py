@@ -0,0 +1,112 @@
+import asyncio
+import weakref
+from typing import Any, AsyncGenerator, Dict, List, Optional
+
+import httpx
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+
+
+class InferenceWorker:
+    """
+    複数のLLMインスタンスで1つのAPIクライアントを共有して推論を行うワーカー
+
+    インスタンスごとにクライアントを作らず、同じイベントループ上の推論要求を
+    1つの`AsyncOpenAI`クライアント（コネクションプール）に集約します。
+    同時に実行するストリーミング要求の数は`max_concurrency`で制限します。
+    利用するLLMは`acquire`/`arelease`で参照数を管理し、参照がなくなるとクライアントを閉じます。
+    """
+
+    def __init__(
+        self,
+        *,
+        max_concurrency: int = 8,
+        max_keepalive_connections: int = 32,
+    ):
+        """
+        Args:
+            max_concurrency: 同時に実行する推論要求の最大数
+            max_keepalive_connections: 再利用のために保持する接続の最大数
+        """
+        self.max_concurrency = max_concurrency
+        self.max_keepalive_connections = max_keepalive_connections
+        self._client: Optional[AsyncOpenAI] = None
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._refcount = 0
+
+    @property
+    def client(self) -> AsyncOpenAI:
+        """共有するAPIクライアント（初回アクセス時に作成）"""
+        if self._client is None:
+            # 相槌と回答の要求が同時に来ても新しい接続を張らずに済むよう、接続を保持しておく
+            http_client = DefaultAsyncHttpxClient(
+                limits=httpx.Limits(
+                    max_connections=max(
+                        self.max_concurrency, self.max_keepalive_connections
+                    ),
+                    max_keepalive_connections=self.max_keepalive_connections,
+                )
+            )
+            self._client = AsyncOpenAI(http_client=http_client)
+        return self._client
+
+    def acquire(self) -> None:
+        """ワーカーの利用を開始（参照数を増やす）"""
+        self._refcount += 1
+
+    async def arelease(self) -> None:
+        """ワーカーの利用を終了（参照がなくなればクライアントを閉じる）"""
+        self._refcount = max(self._refcount - 1, 0)
+        if self._refcount == 0:
+            await self.aclose()
+
+    async def arun(
+        self, model: str, messages: List[Dict[str, Any]]
+    ) -> AsyncGenerator[Any, None]:
+        """
+        ストリーミングで推論を実行
+
+        Args:
+            model: 使用するモデル
+            messages: OpenAI APIメッセージ形式のメッセージ
+
+        Yields:
+            APIから返されたストリーミングチャンク
+        """
+        async with self._semaphore:
+            response = await self.client.chat.completions.create(
+                messages=messages,
+                model=model,
+                stream=True,
+            )
+            try:
+                async for chunk in response:
+                    yield chunk
+            finally:
+                await response.close()
+
+    async def aclose(self):
+        """APIクライアントを解放"""
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+
+
+# イベントループごとに共有するワーカー（クライアントの接続はループに紐づくため）
+_workers: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, InferenceWorker]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_inference_worker() -> InferenceWorker:
+    """
+    実行中のイベントループで共有するInferenceWorkerを取得
+
+    Returns:
+        InferenceWorker: 共有ワーカー
+    """
+    loop = asyncio.get_running_loop()
+    worker = _workers.get(loop)
+    if worker is None:
+        worker = InferenceWorker()
+        _workers[loop] = worker
+    return worker
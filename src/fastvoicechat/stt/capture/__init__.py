@@ -1,4 +1,5 @@
 from .base import BaseCapture
 from .pyaudiocapture import PyAudioCapture
+from .ringbuffer import AudioRingBuffer, AudioRingReader
 
-__all__ = ["BaseCapture", "PyAudioCapture"]
+__all__ = ["BaseCapture", "PyAudioCapture", "AudioRingBuffer", "AudioRingReader"]
@@ -1,10 +1,12 @@
 import asyncio
 import logging
-from typing import List
+import threading
+from typing import List, Optional
 
 import pyaudio
 
 from fastvoicechat.stt.capture.base import BaseCapture
+from fastvoicechat.stt.capture.ringbuffer import AudioRingBuffer, AudioRingReader
 
 # 定数
 RATE = 16000
@@ -15,14 +17,31 @@ BYTE_PER_SAMPLE = 2  # 16bit
 class PyAudioCapture(BaseCapture):
     """
     PyAudioの非同期ラッパークラス
+
+    取得した音声はリングバッファに書き込み、`create_reader()`で作成した読み手に配信します。
     """
 
-    def __init__(self, queue_list: List[asyncio.Queue], rate: int = RATE):
-        self.queue_list = queue_list
+    def __init__(
+        self,
+        queue_list: Optional[List[asyncio.Queue]] = None,
+        rate: int = RATE,
+        *,
+        capacity: int = 64,
+    ):
+        """
+        Args:
+            queue_list: リングバッファとは別に音声を送るキュー（従来の配信方法との互換用）
+            rate: サンプリングレート
+            capacity: リングバッファに保持するフレーム数
+        """
+        self.queue_list = queue_list or []
         self.rate = rate
         self.audio_interface = pyaudio.PyAudio()
 
         self.read_frame_count = BASE_CHUNK
+        self.ring_buffer = AudioRingBuffer(
+            self.read_frame_count * BYTE_PER_SAMPLE, capacity
+        )
         self.audio_stream = self.audio_interface.open(
             format=pyaudio.paInt16,
             channels=1,
@@ -33,38 +52,74 @@ class PyAudioCapture(BaseCapture):
 
         self.stop_event = asyncio.Event()
         self._task = None
+        # 読み取りスレッドの停止用（スレッドから参照するためthreading.Eventを使う）
+        self._thread_stop = threading.Event()
 
-    async def arun(self):
-        """
-        非同期のメインループ
+    def _read_loop(self, loop: asyncio.AbstractEventLoop):
         """
-        loop = asyncio.get_running_loop()
+        読み取りスレッドの処理
 
+        PyAudioの同期APIで読み取ったフレームを、イベントループ上の`_on_frame`に渡します。
+        """
         try:
-            while not self.stop_event.is_set():
-                # PyAudioは同期APIなのでrun_in_executorで実行
-                audio_data = await loop.run_in_executor(
-                    None,
-                    lambda: self.audio_stream.read(
-                        self.read_frame_count, exception_on_overflow=False
-                    ),
+            while not self._thread_stop.is_set():
+                audio_data = self.audio_stream.read(
+                    self.read_frame_count, exception_on_overflow=False
                 )
+                loop.call_soon_threadsafe(self._on_frame, audio_data)
+        except RuntimeError:
+            # イベントループが既に閉じられている
+            pass
+        except Exception as e:
+            logging.error(f"Error in AudioCapture: {e}")
+            try:
+                loop.call_soon_threadsafe(self.stop_event.set)
+            except RuntimeError:
+                pass
+
+    def _on_frame(self, audio_data: bytes):
+        """読み取ったフレームを読み手へ配信（イベントループ上で実行）"""
+        self.ring_buffer.write(audio_data)
+        for queue in self.queue_list:
+            queue.put_nowait(audio_data)
 
-                # 各キューにデータを送信
-                for queue in self.queue_list:
-                    await queue.put(audio_data)
+    async def arun(self):
+        """
+        非同期のメインループ
 
-                # CPU使用率を下げるために少し待機
-                await asyncio.sleep(0.001)
+        フレームごとにexecutorへ読み取りを依頼せず、常駐する1本の読み取りスレッドで読み続けます。
+        """
+        loop = asyncio.get_running_loop()
+        self._thread_stop.clear()
+        thread = threading.Thread(
+            target=self._read_loop,
+            args=(loop,),
+            name="PyAudioCapture",
+            daemon=True,
+        )
+        thread.start()
 
-        except Exception as e:
-            logging.error(f"Error in AudioCapture: {e}")
+        try:
+            await self.stop_event.wait()
         finally:
+            self._thread_stop.set()
+            # 読み取り中のフレームが返るまで待ってからストリームを閉じる
+            await loop.run_in_executor(None, thread.join)
+
             # クリーンアップ
             self.audio_stream.stop_stream()
             self.audio_stream.close()
             self.audio_interface.terminate()
 
+    def create_reader(self) -> AudioRingReader:
+        """
+        キャプチャした音声を読む読み手を作成
+
+        Returns:
+            AudioRingReader: asyncio.Queueと同様に使える読み手
+        """
+        return self.ring_buffer.create_reader()
+
     async def astart(self):
         """
         非同期タスクを開始
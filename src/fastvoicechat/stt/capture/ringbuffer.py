@@ -0,0 +1,209 @@
+import asyncio
+import logging
+from typing import List, Tuple
+
+
+class AudioRingBuffer:
+    """
+    複数の読み手に音声フレームを配信するリングバッファ
+
+    書き込みは1つの`bytearray`へのコピーとインデックスの更新のみで行い、
+    読み手ごとのキューを持たずに、待っているインデックスに達した読み手だけを起こします。
+    読み手が`capacity`フレーム以上遅れた場合は、古いフレームを読み飛ばします。
+    """
+
+    def __init__(self, frame_bytes: int, capacity: int = 64):
+        """
+        Args:
+            frame_bytes: 1フレームの最大バイト数
+            capacity: 保持するフレーム数
+        """
+        self.frame_bytes = frame_bytes
+        self.capacity = capacity
+        self._buffer = bytearray(frame_bytes * capacity)
+        self._view = memoryview(self._buffer)
+        self._lengths: List[int] = [0] * capacity
+        self._write_index = 0
+        # (待っているフレームのインデックス, 起こすためのFuture)
+        self._waiters: List[Tuple[int, asyncio.Future]] = []
+
+    def write(self, data: bytes) -> None:
+        """
+        フレームを書き込み、待機中の読み手を起こす
+
+        Args:
+            data: 音声フレーム
+        """
+        length = min(len(data), self.frame_bytes)
+        slot = self._write_index % self.capacity
+        offset = slot * self.frame_bytes
+        self._view[offset : offset + length] = data[:length]
+        self._lengths[slot] = length
+        self._write_index += 1
+
+        if self._waiters:
+            remaining = []
+            for index, waiter in self._waiters:
+                if index >= self._write_index:
+                    remaining.append((index, waiter))
+                elif not waiter.done():
+                    waiter.set_result(None)
+            self._waiters = remaining
+
+    def read(self, index: int) -> bytes:
+        """
+        指定したインデックスのフレームを取得
+
+        Args:
+            index: フレームのインデックス
+
+        Returns:
+            bytes: 音声フレーム（書き込みで上書きされないようコピーを返す）
+        """
+        return bytes(self.view(index))
+
+    def view(self, index: int) -> memoryview:
+        """
+        指定したインデックスのフレームをコピーせずに取得
+
+        Args:
+            index: フレームのインデックス
+
+        Returns:
+            memoryview: バッファ上のフレーム。`capacity`フレーム後の書き込みで上書きされる
+        """
+        slot = index % self.capacity
+        offset = slot * self.frame_bytes
+        return self._view[offset : offset + self._lengths[slot]]
+
+    def create_reader(self) -> "AudioRingReader":
+        """
+        これから書き込まれるフレームを読む読み手を作成
+
+        Returns:
+            AudioRingReader: 読み手
+        """
+        return AudioRingReader(self)
+
+    @property
+    def write_index(self) -> int:
+        """次に書き込むフレームのインデックス"""
+        return self._write_index
+
+    async def await_write(self) -> None:
+        """次のフレームが書き込まれるまで待機"""
+        await self.await_index(self._write_index)
+
+    async def await_index(self, index: int) -> None:
+        """
+        指定したインデックスのフレームが書き込まれるまで待機
+
+        途中のフレームの書き込みでは起床しないため、複数フレームをまとめて待つ場合に使います。
+
+        Args:
+            index: フレームのインデックス
+        """
+        if index < self._write_index:
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append((index, waiter))
+        await waiter
+
+
+class AudioRingReader:
+    """
+    AudioRingBufferの読み手
+
+    `asyncio.Queue`と同じ`get`/`get_nowait`/`empty`/`qsize`を持つため、
+    音声認識やVADの`audio_queue`としてそのまま使用できます。
+    """
+
+    def __init__(self, ring: AudioRingBuffer):
+        self._ring = ring
+        self._cursor = ring.write_index
+        # 読み遅れて上書きされたフレームの累計
+        self.skipped_frames = 0
+
+    def _skip_overwritten(self) -> None:
+        """上書き済みのフレームを読み飛ばす"""
+        oldest = self._ring.write_index - self._ring.capacity
+        if self._cursor < oldest:
+            logging.debug(f"[AudioRingReader]: skipped {oldest - self._cursor} frames")
+            self.skipped_frames += oldest - self._cursor
+            self._cursor = oldest
+
+    async def get(self) -> bytes:
+        """次のフレームを取得（書き込まれるまで待機）"""
+        while self.empty():
+            await self._ring.await_write()
+        return self.get_nowait()
+
+    def get_nowait(self) -> bytes:
+        """次のフレームを取得（なければasyncio.QueueEmptyを送出）"""
+        if self.empty():
+            raise asyncio.QueueEmpty
+        self._skip_overwritten()
+        data = self._ring.read(self._cursor)
+        self._cursor += 1
+        return data
+
+    async def get_view(self) -> memoryview:
+        """
+        次のフレームをコピーせずに取得（書き込まれるまで待機）
+
+        返り値はリングバッファ上のビューで、後続の書き込みで上書きされます。
+        受け取ったらすぐに自前のバッファへ連結するなど、保持しない用途で使用してください。
+        """
+        while self.empty():
+            await self._ring.await_write()
+        self._skip_overwritten()
+        data = self._ring.view(self._cursor)
+        self._cursor += 1
+        return data
+
+    async def aread(self, nbytes: int) -> bytes:
+        """
+        未読のフレームがnbytes以上溜まるまで待ち、まとめて取得
+
+        足りないフレーム数分だけ先の書き込みを待つため、フレームごとには起床しません。
+        フレームの途中では分割せず、nbytes以上になるまでのフレームを連結して返します。
+
+        Args:
+            nbytes: 取得する最小のバイト数
+
+        Returns:
+            bytes: 連結した音声
+        """
+        ring = self._ring
+        if nbytes > ring.frame_bytes * ring.capacity:
+            raise ValueError(
+                f"nbytes must be <= {ring.frame_bytes * ring.capacity}, got {nbytes}"
+            )
+
+        while True:
+            self._skip_overwritten()
+            available = sum(
+                len(ring.view(index)) for index in range(self._cursor, ring.write_index)
+            )
+            if available >= nbytes:
+                break
+            missing_frames = -(-(nbytes - available) // ring.frame_bytes)
+            await ring.await_index(ring.write_index + missing_frames - 1)
+
+        parts = []
+        total = 0
+        while total < nbytes:
+            view = ring.view(self._cursor)
+            parts.append(view)
+            total += len(view)
+            self._cursor += 1
+        return b"".join(parts)
+
+    def empty(self) -> bool:
+        """未読のフレームがなければTrue"""
+        return self._cursor >= self._ring.write_index
+
+    def qsize(self) -> int:
+        """未読のフレーム数"""
+        self._skip_overwritten()
+        return self._ring.write_index - self._cursor
@@ -40,7 +40,7 @@ class BaseRecognition(ABC):
     @property
     @abstractmethod
     def audio_queue(self) -> asyncio.Queue:
-        """音声データのキュー"""
+        """音声データのキュー（asyncio.Queueと同じget/get_nowait/emptyを持つオブジェクト）"""
         pass
 
     @abstractmethod
@@ -1,19 +1,24 @@
 import asyncio
+import functools
 import logging
-import queue
 import threading
 import time
 import traceback
-from typing import Any, Callable, Coroutine, Dict, Optional
+from collections import deque
+from typing import Any, Callable, Coroutine, Deque, Dict, Optional
 
 from google.cloud import speech
 
+from fastvoicechat.base import aget_until, is_blocking
 from fastvoicechat.stt.recognition.base import BaseRecognition
 
 # 定数
 RATE = 16000
 STT_CHUNK = 1600
 BYTE_PER_SAMPLE = 2  # 16bit
+MAX_BACKOFF = 1.0  # セッションの失敗が続いたときの最大待機秒数
+WATCHDOG_INTERVAL = 5  # ウォッチドッグの確認間隔（秒）
+INACTIVITY_TIMEOUT = 10  # この秒数活動がなければセッションを再起動する
 
 
 class GoogleSpeechRecognition(BaseRecognition):
@@ -50,16 +55,33 @@ class GoogleSpeechRecognition(BaseRecognition):
         # 状態管理
         self._state: Dict[str, Any] = {}
         self._task: Optional[asyncio.Task] = None
-        self._lock = asyncio.Lock()
+        # 連続して失敗したセッションの数（再開までの待機時間に使う）
+        self._consecutive_failures = 0
 
-        # 認識が継続しているか監視するためのタイムスタンプ
-        self._last_activity = time.time()
+        # 認識が継続しているか監視するためのタイムスタンプ（時計の調整の影響を受けないmonotonic）
+        self._last_activity = time.monotonic()
         self._recognition_active = False
+        # 送信が追いつかずに捨てた音声チャンクの数（セッションごとにリセット）
+        self.dropped_frames = 0
+        # セッションの再起動ごとにgRPCチャネルを張り直さないよう、クライアントを使い回す
+        self._speech_client: Optional[speech.SpeechClient] = None
+        # 設定はコンストラクタ引数から決まるため、初回に作成したものを使い回す
+        self._streaming_config: Optional[speech.StreamingRecognitionConfig] = None
+
+    @property
+    def speech_client(self) -> speech.SpeechClient:
+        """Google STTのクライアント（初回アクセス時に作成）"""
+        if self._speech_client is None:
+            self._speech_client = speech.SpeechClient()
+        return self._speech_client
 
     def create_streaming_config(self) -> speech.StreamingRecognitionConfig:
         """
-        Google STTの設定を作成
+        Google STTの設定を作成（2回目以降は作成済みの設定を返す）
         """
+        if self._streaming_config is not None:
+            return self._streaming_config
+
         config = speech.RecognitionConfig(
             encoding=speech.RecognitionConfig.AudioEncoding.LINEAR16,
             sample_rate_hertz=self.rate,
@@ -72,12 +94,12 @@ class GoogleSpeechRecognition(BaseRecognition):
             ],
             enable_automatic_punctuation=True,  # 自動句読点を有効化
         )
-        streaming_config = speech.StreamingRecognitionConfig(
+        self._streaming_config = speech.StreamingRecognitionConfig(
             config=config,
             interim_results=True,
             single_utterance=self.single_utterance,
         )
-        return streaming_config
+        return self._streaming_config
 
     async def arun(self):
         """
@@ -92,7 +114,7 @@ class GoogleSpeechRecognition(BaseRecognition):
                 watchdog_task = asyncio.create_task(self._arecognition_watchdog())
 
                 # 音声認識タスク
-                await self._arun_recognition_session()
+                succeeded = await self._arun_recognition_session()
 
                 # ウォッチドッグをキャンセル
                 watchdog_task.cancel()
@@ -101,108 +123,194 @@ class GoogleSpeechRecognition(BaseRecognition):
                 except asyncio.CancelledError:
                     pass
 
-                # セッションが終了または例外で中断された場合、少し待機してから次のセッションを開始
-                await asyncio.sleep(0.5)
+                # 正常に終了した場合は待たずに次のセッションを開始し、失敗が続く場合だけ間隔を空ける
+                if succeeded:
+                    self._consecutive_failures = 0
+                else:
+                    await self._abackoff()
             except Exception as e:
                 logging.error(f"Error in STT main loop: {e}")
                 logging.error(traceback.format_exc())
                 # エラーが発生しても続行するために少し待機
-                await asyncio.sleep(1)
+                await self._abackoff()
+
+    async def _abackoff(self):
+        """連続した失敗の回数に応じて待機（0.1秒から倍々で最大1秒）"""
+        delay = min(MAX_BACKOFF, 0.1 * 2**self._consecutive_failures)
+        self._consecutive_failures += 1
+        await asyncio.sleep(delay)
 
     async def _arecognition_watchdog(self):
         """認識が停止したら再起動するウォッチドッグ"""
+        last_dropped_frames = self.dropped_frames
         while not self.stop_event.is_set() and not self.reset_event.is_set():
-            await asyncio.sleep(5)  # 5秒ごとにチェック
+            await asyncio.sleep(WATCHDOG_INTERVAL)
 
-            current_time = time.time()
-            if self._recognition_active and current_time - self._last_activity > 10:
+            # 音声の送信が詰まり続けている場合は、無活動の10秒を待たずに再起動する
+            if self.dropped_frames > last_dropped_frames:
                 logging.warning(
-                    "音声認識が10秒間活動していません。セッションを再起動します。"
+                    f"音声の送信が滞っています（{self.dropped_frames}チャンク破棄）。"
+                    "セッションを再起動します。"
+                )
+                self.reset_event.set()
+                break
+            last_dropped_frames = self.dropped_frames
+
+            current_time = time.monotonic()
+            if (
+                self._recognition_active
+                and current_time - self._last_activity > INACTIVITY_TIMEOUT
+            ):
+                logging.warning(
+                    f"音声認識が{INACTIVITY_TIMEOUT}秒間活動していません。"
+                    "セッションを再起動します。"
                 )
                 self.reset_event.set()  # 現在のセッションをリセット
                 break
 
-    async def _arun_recognition_session(self):
-        """音声認識の1セッションを実行"""
+    async def _await_session_end(self):
+        """停止またはリセットが要求されるまで待機"""
+        waiters = [
+            asyncio.create_task(self.stop_event.wait()),
+            asyncio.create_task(self.reset_event.wait()),
+        ]
+        try:
+            await asyncio.wait(waiters, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for waiter in waiters:
+                waiter.cancel()
+
+    async def _arun_recognition_session(self) -> bool:
+        """
+        音声認識の1セッションを実行
+
+        Returns:
+            bool: ストリーミングがエラーなく終了した場合True
+        """
         loop = asyncio.get_running_loop()
-        client = speech.SpeechClient()
+        succeeded = True
+        client = self.speech_client
         streaming_config = self.create_streaming_config()
 
-        # 通常の同期キューを使用してイベントループ問題を回避
-        audio_buffer = bytearray()
-        audio_chunks = queue.Queue()
-
         # リクエスト生成のためのスレッド終了フラグとスレッド参照
         thread_stop = threading.Event()
         streaming_thread = None
+        self.dropped_frames = 0
 
-        # AudioCollectorタスク - メインのイベントループで実行
-        async def aaudio_collector():
-            nonlocal audio_buffer
-            try:
-                while (
-                    not self.stop_event.is_set()
-                    and not self.reset_event.is_set()
-                    and not thread_stop.is_set()
-                ):
-                    try:
-                        # 非同期キューからデータを取得
-                        data = await asyncio.wait_for(
-                            self.audio_queue.get(), timeout=0.1
-                        )
+        # 受け取ったフレームはbytesのまま保持し、chunk_bytes分が揃ったときに1回だけ連結する
+        pending: Deque[bytes] = deque()
+        pending_bytes = 0
 
-                        # アクティビティタイムスタンプを更新
-                        self._last_activity = time.time()
-
-                        audio_buffer.extend(data)
-                        # バッファが大きくなりすぎないよう制限
-                        if len(audio_buffer) > self.max_buffer_size:
-                            del audio_buffer[: len(audio_buffer) - self.max_buffer_size]
-
-                        # 十分なデータが溜まったらリクエストキューに追加
-                        if len(audio_buffer) >= self.chunk_bytes:
-                            # バッファの先頭からchunk_bytes分をコピー
-                            chunk_data = bytes(audio_buffer[: self.chunk_bytes])
-                            # 処理済みデータをバッファから削除
-                            del audio_buffer[: self.chunk_bytes]
-                            # 同期キューに追加 (イベントループをまたがない)
-                            audio_chunks.put(chunk_data)
-                    except asyncio.TimeoutError:
-                        continue
-                    except Exception as e:
-                        logging.error(f"Error in audio collector: {e}")
-                        break
-            finally:
-                # コレクター終了時に同期キューを閉じる信号を送る
-                audio_chunks.put(None)
+        # ストリームを閉じたことをanext_chunkに知らせるイベント
+        stream_closed = asyncio.Event()
+
+        def close_stream():
+            thread_stop.set()
+            stream_closed.set()
+
+        # 停止・リセット・ストリームの終了の待機はチャンクごとに作らず使い回す
+        end_waiters = [
+            asyncio.create_task(self._await_session_end()),
+            asyncio.create_task(stream_closed.wait()),
+        ]
+
+        # 読み手がまとめ読みに対応していれば、chunk_bytes分が揃ってから1回だけ起床する
+        aread = getattr(self.audio_queue, "aread", None)
+        skipped_base = getattr(self.audio_queue, "skipped_frames", 0)
+
+        # 送信する音声チャンクを取得するコルーチン - メインのイベントループで実行
+        async def anext_chunk() -> Optional[bytes]:
+            """chunk_bytes分の音声を取得（セッションが終了したらNone）"""
+            nonlocal pending_bytes
+            if aread is not None:
+                data = await aget_until(
+                    functools.partial(aread, self.chunk_bytes), end_waiters
+                )
+                if data is not None:
+                    self._last_activity = time.monotonic()
+                    # 読み遅れて上書きされたフレームを破棄した数として扱う
+                    self.dropped_frames = self.audio_queue.skipped_frames - skipped_base
+                return data
+
+            while pending_bytes < self.chunk_bytes:
+                # 非同期キューからデータを取得
+                data = await aget_until(self.audio_queue.get, end_waiters)
+                if data is None:
+                    return None
+
+                # アクティビティタイムスタンプを更新
+                self._last_activity = time.monotonic()
+
+                # フレームがちょうどchunk_bytesならコピーせずにそのまま渡す
+                if not pending and len(data) == self.chunk_bytes:
+                    return data
+
+                pending.append(data)
+                pending_bytes += len(data)
+
+                # 送信が追いつかずに溜まった音声は古い方から捨てる
+                while not self.audio_queue.empty():
+                    data = self.audio_queue.get_nowait()
+                    pending.append(data)
+                    pending_bytes += len(data)
+                while pending_bytes > self.max_buffer_size:
+                    head = pending.popleft()
+                    excess = pending_bytes - self.max_buffer_size
+                    if len(head) > excess:
+                        pending.appendleft(head[excess:])
+                        pending_bytes -= excess
+                    else:
+                        pending_bytes -= len(head)
+                        self.dropped_frames += 1
+
+            parts = []
+            needed = self.chunk_bytes
+            while needed:
+                head = pending.popleft()
+                if len(head) > needed:
+                    # 余った分は次のチャンクに回す
+                    pending.appendleft(head[needed:])
+                    head = head[:needed]
+                parts.append(head)
+                needed -= len(head)
+            pending_bytes -= self.chunk_bytes
+            return b"".join(parts)
 
         # 同期リクエストジェネレータ関数 (別スレッドで実行される)
+        # 中継用のキューやタスクを挟まず、イベントループ上のanext_chunkから直接取得する
+        # 終了はanext_chunkが返すNoneだけで判断し、スレッド側で停止フラグを確認しない
         def request_generator():
-            while not thread_stop.is_set():
+            nonlocal succeeded
+            while True:
                 try:
-                    # 同期的にキューからデータを取得
-                    chunk = audio_chunks.get(timeout=1.0)
-
-                    # None は終了信号
-                    if chunk is None:
-                        break
-
-                    # チャンクからリクエストを生成
-                    yield speech.StreamingRecognizeRequest(audio_content=chunk)
-                except queue.Empty:
-                    # タイムアウトは無視して続行
-                    continue
+                    chunk = asyncio.run_coroutine_threadsafe(
+                        anext_chunk(), loop
+                    ).result()
                 except Exception as e:
                     logging.error(f"Error in request_generator: {e}")
-                    break
+                    # 正常終了として扱うと、失敗が続いても間隔を空けずに再開してしまう
+                    succeeded = False
+                    return
+
+                # None は終了信号（ストリームを閉じると待機中のanext_chunkもNoneを返す）
+                if chunk is None:
+                    return
+
+                # チャンクからリクエストを生成
+                yield speech.StreamingRecognizeRequest(audio_content=chunk)
 
         # 別スレッドでストリーミング処理を実行
+        # 実行中のストリーミング呼び出し（終了時にサーバーの応答を待たずに打ち切るため保持）
+        streaming_call = None
+
         def run_streaming():
+            nonlocal streaming_call, succeeded
             try:
                 # このスレッド内で例外が発生してもプログラム全体が停止しないようにする
                 responses = client.streaming_recognize(
                     config=streaming_config, requests=request_generator()
                 )
+                streaming_call = responses
 
                 # レスポンスをメインスレッドに渡す
                 for response in responses:
@@ -212,24 +320,36 @@ class GoogleSpeechRecognition(BaseRecognition):
                     if not response.results:
                         continue
 
-                    # レスポンスをキューに入れて、メインスレッドで処理
-                    response_queue.put(response)
+                    # レスポンスをイベントループのキューに直接入れて、メインスレッドで処理
+                    loop.call_soon_threadsafe(response_queue.put_nowait, response)
             except Exception as e:
-                logging.error(f"Streaming thread error: {e}")
-                logging.error(traceback.format_exc())
+                if thread_stop.is_set():
+                    # セッション終了時に呼び出しを打ち切った場合
+                    logging.debug(f"Streaming call cancelled: {e}")
+                else:
+                    logging.error(f"Streaming thread error: {e}")
+                    logging.error(traceback.format_exc())
+                    succeeded = False
             finally:
                 # スレッド終了のシグナルを送る
-                response_queue.put(None)
+                # レスポンスと同じくcall_soon_threadsafeで送るため、先に送ったレスポンスより後に届く
+                try:
+                    loop.call_soon_threadsafe(stream_ended.set)
+                except RuntimeError:
+                    # イベントループが既に閉じられている
+                    pass
 
         # ストリーミングレスポンスをやり取りするためのキュー
-        response_queue = queue.Queue()
-
-        # オーディオコレクタータスクを開始
-        collector_task = asyncio.create_task(aaudio_collector())
+        # スレッドからはcall_soon_threadsafeで追加するため、executorを介さずに受け取れる
+        response_queue: asyncio.Queue = asyncio.Queue()
+        # ストリーミングスレッドが終了したことを知らせるイベント
+        stream_ended = asyncio.Event()
+        # 停止・リセット・ストリーミングの終了のいずれかでレスポンスの待機を打ち切る
+        response_waiters = [end_waiters[0], asyncio.create_task(stream_ended.wait())]
 
         # 認識アクティブフラグをセット
         self._recognition_active = True
-        self._last_activity = time.time()
+        self._last_activity = time.monotonic()
 
         try:
             # ストリーミングスレッドを開始
@@ -240,17 +360,20 @@ class GoogleSpeechRecognition(BaseRecognition):
             # レスポンスを処理
             while not self.stop_event.is_set() and not self.reset_event.is_set():
                 try:
-                    # レスポンスキューから結果を取得
-                    response = await loop.run_in_executor(
-                        None, lambda: response_queue.get(timeout=2.0)
-                    )
+                    # レスポンスキューから結果を取得（届いていればタスクを作らずに取り出す）
+                    if not response_queue.empty():
+                        response = response_queue.get_nowait()
+                    else:
+                        response = await aget_until(
+                            response_queue.get, response_waiters
+                        )
 
-                    # None は終了シグナル
+                    # None は待機の打ち切り
                     if response is None:
                         break
 
                     # アクティビティタイムスタンプを更新
-                    self._last_activity = time.time()
+                    self._last_activity = time.monotonic()
 
                     # レスポンスを処理
                     for result in response.results:
@@ -259,27 +382,29 @@ class GoogleSpeechRecognition(BaseRecognition):
                             result_type = "final" if result.is_final else "interim"
                             result_dict = {"type": result_type, "text": transcript}
 
-                            await self._aupdate_state(result_dict)
+                            # 前回と同じ結果ならコールバックも呼ばない
+                            if not await self._aupdate_state(result_dict):
+                                continue
 
                             # コールバック呼び出し
                             if self.callback:
                                 try:
-                                    if asyncio.iscoroutinefunction(self.callback):
+                                    if self._callback_is_coro:
                                         await self.callback(result_dict)
-                                    else:
+                                    elif self._callback_is_blocking:
                                         await loop.run_in_executor(
                                             None, self.callback, result_dict
                                         )
+                                    else:
+                                        # 軽い同期処理はスレッドに渡さずそのまま呼び出す
+                                        self.callback(result_dict)
                                 except Exception as cb_err:
                                     logging.error(f"Callback error: {cb_err}")
 
                             if result.is_final and self.single_utterance:
-                                thread_stop.set()
+                                close_stream()
                                 break
 
-                except queue.Empty:
-                    # タイムアウトしたが続行
-                    continue
                 except Exception as e:
                     logging.error(f"Error processing response: {e}")
                     logging.error(traceback.format_exc())
@@ -287,24 +412,27 @@ class GoogleSpeechRecognition(BaseRecognition):
         except Exception as e:
             logging.error(f"Error in recognition session: {e}")
             logging.error(traceback.format_exc())
+            succeeded = False
 
         finally:
             # 認識非アクティブに設定
             self._recognition_active = False
 
             # スレッド停止フラグを設定
-            thread_stop.set()
+            # 待機中のanext_chunkはNoneを返すため、リクエストジェネレータも抜ける
+            close_stream()
+            for waiter in (*end_waiters, *response_waiters):
+                waiter.cancel()
 
-            # ストリーミングスレッドが存在する場合は待機
+            # ストリーミングスレッドが存在する場合は待機（イベントループは止めない）
+            # 送信を終えた後もサーバーの応答でスレッドが止まらないよう、呼び出しを打ち切る
             if streaming_thread and streaming_thread.is_alive():
-                streaming_thread.join(timeout=2.0)
+                cancel = getattr(streaming_call, "cancel", None)
+                if cancel is not None:
+                    cancel()
+                await loop.run_in_executor(None, streaming_thread.join, 2.0)
 
-            # タスクのクリーンアップ
-            collector_task.cancel()
-            try:
-                await collector_task
-            except asyncio.CancelledError:
-                pass
+        return succeeded
 
     async def process_audio(self, audio_data: bytes) -> Optional[Dict[str, Any]]:
         """音声データを処理し、認識結果を返す"""
@@ -328,6 +456,14 @@ class GoogleSpeechRecognition(BaseRecognition):
         if self._task is not None and not self._task.done():
             await self._task
 
+        # クライアントのgRPCチャネルを閉じる
+        if self._speech_client is not None:
+            try:
+                self._speech_client.transport.close()
+            except Exception as e:
+                logging.error(f"Error closing speech client: {e}")
+            self._speech_client = None
+
     async def astart_new_session(self):
         """
         新しいセッションを開始
@@ -364,13 +500,22 @@ class GoogleSpeechRecognition(BaseRecognition):
     async def _aupdate_state(self, result_dict):
         """
         状態を更新
+
+        状態はイベントループ上の認識タスクからのみ更新するため、ロックは使いません。
+
+        Returns:
+            bool: 結果が変化した場合はTrue
         """
-        async with self._lock:
-            previous_text = self._state.get("result", {}).get("text", "")
-            text = str(result_dict.get("text", ""))
-            delta = text[len(previous_text) :]
-            self._state["delta"] = delta
-            self._state["result"] = result_dict
+        previous_result = self._state.get("result")
+        if result_dict == previous_result:
+            return False
+
+        # 差分は参照されたときにだけ計算するため、直前のテキストだけを保持する
+        self._state["previous_text"] = (
+            previous_result["text"] if previous_result else ""
+        )
+        self._state["result"] = result_dict
+        return True
 
     async def reset(self):
         """
@@ -385,8 +530,7 @@ class GoogleSpeechRecognition(BaseRecognition):
         """
         状態をリセット
         """
-        async with self._lock:
-            self._state.clear()
+        self._state.clear()
 
     @property
     def result(self):
@@ -399,12 +543,30 @@ class GoogleSpeechRecognition(BaseRecognition):
 
     @property
     def delta(self):
-        return self._state.get("delta", "")
+        result = self._state.get("result")
+        if not result:
+            return ""
+        return result["text"][len(self._state["previous_text"]) :]
 
     @property
     def audio_queue(self) -> asyncio.Queue:
         return self._audio_queue
 
+    @audio_queue.setter
+    def audio_queue(self, value: asyncio.Queue) -> None:
+        self._audio_queue = value
+
+    @property
+    def callback(self) -> Optional[Callable[[Dict[str, Any]], Any]]:
+        return self._callback
+
+    @callback.setter
+    def callback(self, value: Optional[Callable[[Dict[str, Any]], Any]]) -> None:
+        # 呼び出し方は結果ごとに判定せず、設定時に1回だけ判定する
+        self._callback = value
+        self._callback_is_coro = asyncio.iscoroutinefunction(value)
+        self._callback_is_blocking = value is not None and is_blocking(value)
+
 
 if __name__ == "__main__":
     from fastvoicechat.stt.capture import PyAudioCapture
@@ -416,7 +578,8 @@ if __name__ == "__main__":
     async def async_main_with_monitoring():
         """非同期メイン関数"""
         recognition = GoogleSpeechRecognition(callback=async_recognition_callback)
-        capture = PyAudioCapture([recognition.audio_queue])
+        capture = PyAudioCapture()
+        recognition.audio_queue = capture.create_reader()
         await capture.astart()
         await recognition.astart()
         print("capture started")
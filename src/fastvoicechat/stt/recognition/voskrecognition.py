@@ -1,10 +1,14 @@
 import asyncio
+import functools
 import json
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Callable, Coroutine, Dict, Optional
 
 from vosk import KaldiRecognizer, Model, SetLogLevel
 
+from fastvoicechat.base import aget_until, is_blocking
 from fastvoicechat.stt.recognition.base import BaseRecognition
 
 # 定数
@@ -13,6 +17,7 @@ BASE_CHUNK = 160
 STT_CHUNK = 1600
 VAD_CHUNK = 160
 BYTE_PER_SAMPLE = 2  # 16bit
+MAX_BACKOFF = 1.0  # セッションの失敗が続いたときの最大待機秒数
 
 
 class VoskRecognition(BaseRecognition):
@@ -32,6 +37,7 @@ class VoskRecognition(BaseRecognition):
         rate: int = RATE,
         single_utterance: bool = False,
         max_buffer_size: Optional[int] = None,
+        partial_interval: float = 0.05,
     ):
         self._audio_queue = audio_queue or asyncio.Queue()
         self.callback = callback
@@ -40,6 +46,8 @@ class VoskRecognition(BaseRecognition):
         self.chunk_bytes = chunk * 2  # 16bit = 2 bytes per sample
         self.max_buffer_size = max_buffer_size or chunk * 10
         self.single_utterance = single_utterance
+        # 中間結果を取得する最小間隔（秒）。最終結果は間隔に関係なく取得する
+        self.partial_interval = partial_interval
 
         # Voskの設定
         SetLogLevel(-1)  # ログレベルを最小に
@@ -56,7 +64,15 @@ class VoskRecognition(BaseRecognition):
         # 状態管理
         self._state: Dict[str, Any] = {}
         self._task: Optional[asyncio.Task] = None
-        self._lock = asyncio.Lock()
+        # 連続して失敗したセッションの数（再開までの待機時間に使う）
+        self._consecutive_failures = 0
+        # KaldiRecognizerの呼び出しを順番に実行する専用スレッド（既定のexecutorと共有しない）
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # 直前の中間結果（解析前の文字列と解析結果）
+        self._last_raw_partial = ""
+        self._last_partial_result: Optional[Dict[str, Any]] = None
+        # 直前に中間結果を取得した時刻（time.monotonic_ns）
+        self._last_partial_ns = 0
 
     async def arun(self):
         """
@@ -68,62 +84,135 @@ class VoskRecognition(BaseRecognition):
                 await self.pause_event.wait()
 
                 # 音声認識セッション
-                await self._arun_recognition_session()
-
-                # セッションが終了または例外で中断された場合、少し待機してから次のセッションを開始
-                await asyncio.sleep(0.5)
+                # 正常に終了した場合は待たずに次のセッションを開始し、失敗が続く場合だけ間隔を空ける
+                if await self._arun_recognition_session():
+                    self._consecutive_failures = 0
+                else:
+                    await self._abackoff()
             except Exception as e:
                 logging.error(f"Error in STT main loop: {e}")
-                await asyncio.sleep(1)
+                await self._abackoff()
 
-    async def _arun_recognition_session(self):
-        """音声認識の1セッションを実行"""
+    async def _abackoff(self):
+        """連続した失敗の回数に応じて待機（0.1秒から倍々で最大1秒）"""
+        delay = min(MAX_BACKOFF, 0.1 * 2**self._consecutive_failures)
+        self._consecutive_failures += 1
+        await asyncio.sleep(delay)
+
+    async def _arun_recognition_session(self) -> bool:
+        """
+        音声認識の1セッションを実行
+
+        Returns:
+            bool: エラーなく終了した場合True
+        """
+        succeeded = True
+
+        # 停止・リセットの待機はループごとに作らず使い回す
+        waiters = [
+            asyncio.create_task(self.stop_event.wait()),
+            asyncio.create_task(self.reset_event.wait()),
+        ]
+
+        # 読み手がまとめ読みに対応していれば、chunk_bytes分が揃ってから1回だけ起床する
+        aread = getattr(self.audio_queue, "aread", None)
+        aget = (
+            functools.partial(aread, self.chunk_bytes)
+            if aread is not None
+            else self.audio_queue.get
+        )
 
         try:
             while not self.stop_event.is_set() and not self.reset_event.is_set():
                 try:
-                    # 非同期キューからデータを取得
-                    data = await asyncio.wait_for(self.audio_queue.get(), timeout=0.1)
+                    # 非同期キューからデータを取得（停止・リセットされたらNone）
+                    data = await aget_until(aget, waiters)
+                    if data is None:
+                        break
+
+                    # 既に届いているフレームはchunk_bytesまでまとめて1回で認識器に渡す
+                    if not self.audio_queue.empty() and len(data) < self.chunk_bytes:
+                        buffer = bytearray(data)
+                        while (
+                            not self.audio_queue.empty()
+                            and len(buffer) < self.chunk_bytes
+                        ):
+                            buffer += self.audio_queue.get_nowait()
+                        data = bytes(buffer)
+
                     previous_result = self.result
                     result = await self.process_audio(data)
                     if result and result != previous_result:
                         await self._acall_callback(result)
 
-                except asyncio.TimeoutError:
-                    continue
                 except Exception as e:
                     logging.error(f"Error in recognition session: {e}")
+                    succeeded = False
                     break
 
         except Exception as e:
             logging.error(f"Error in recognition session: {e}")
+            succeeded = False
+        finally:
+            for waiter in waiters:
+                waiter.cancel()
 
-    async def process_audio(self, audio_data: bytes) -> Optional[Dict[str, Any]]:
-        """音声データを処理し、認識結果を返す"""
-        loop = asyncio.get_running_loop()
-        result_dict = None
+        return succeeded
 
-        # Vosk認識処理は同期的なので、別スレッドで実行
-        is_accepted = await loop.run_in_executor(
-            None, self.recognizer.AcceptWaveform, audio_data
-        )
+    def _recognize(self, audio_data: bytes) -> Optional[Dict[str, Any]]:
+        """
+        音声データを認識器に渡して結果を取得（専用スレッドで実行）
 
-        if is_accepted:
+        AcceptWaveformと結果の取得・JSONの解析をまとめて行い、
+        executorとのやり取りを1フレームにつき1回にします。
+        """
+        if self.recognizer.AcceptWaveform(audio_data):
             # 最終結果を取得
+            self._last_partial_ns = 0
             result = json.loads(self.recognizer.Result())
             if result.get("text"):
-                result_dict = {"type": "final", "text": result["text"]}
-                await self._aupdate_state(result_dict)
-
+                return {"type": "final", "text": result["text"]}
         else:
+            # 前回の取得から間もない場合は中間結果を取得せず、前回の結果を返す
+            # 認識器は内部で状態を保持しているため、次に取得したときに反映される
+            now = time.monotonic_ns()
+            if now - self._last_partial_ns < self.partial_interval * 1e9:
+                return self._last_partial_result
+            self._last_partial_ns = now
+
             # 中間結果を取得
-            partial = json.loads(self.recognizer.PartialResult())
-            if partial.get("partial"):
-                result_dict = {
-                    "type": "interim",
-                    "text": partial["partial"],
-                }
-                await self._aupdate_state(result_dict)
+            # 中間結果は同じ内容が続くことが多いため、前回と同じ文字列ならJSONを解析しない
+            raw_partial = self.recognizer.PartialResult()
+            if raw_partial != self._last_raw_partial:
+                self._last_raw_partial = raw_partial
+                partial = json.loads(raw_partial)
+                self._last_partial_result = (
+                    {"type": "interim", "text": partial["partial"]}
+                    if partial.get("partial")
+                    else None
+                )
+            return self._last_partial_result
+        return None
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """認識処理を実行する専用のexecutor"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="vosk"
+            )
+        return self._executor
+
+    async def process_audio(self, audio_data: bytes) -> Optional[Dict[str, Any]]:
+        """音声データを処理し、認識結果を返す"""
+        loop = asyncio.get_running_loop()
+
+        # Vosk認識処理は同期的なので、専用スレッドで実行
+        result_dict = await loop.run_in_executor(
+            self.executor, self._recognize, audio_data
+        )
+        if result_dict:
+            await self._aupdate_state(result_dict)
 
         return result_dict
 
@@ -131,19 +220,31 @@ class VoskRecognition(BaseRecognition):
         """コールバック関数を呼び出す"""
         if self.callback:
             try:
-                if asyncio.iscoroutinefunction(self.callback):
+                if self._callback_is_coro:
                     await self.callback(result_dict)
-                else:
+                elif self._callback_is_blocking:
                     await asyncio.get_running_loop().run_in_executor(
                         None, self.callback, result_dict
                     )
+                else:
+                    # 軽い同期処理はスレッドに渡さずそのまま呼び出す
+                    self.callback(result_dict)
             except Exception as e:
                 logging.error(f"Callback error: {e}")
 
-    async def _aupdate_state(self, result_dict: Dict[str, Any]):
-        """状態を更新"""
-        async with self._lock:
-            self._state["result"] = result_dict
+    async def _aupdate_state(self, result_dict: Dict[str, Any]) -> bool:
+        """
+        状態を更新
+
+        状態はイベントループ上の認識タスクからのみ更新するため、ロックは使いません。
+
+        Returns:
+            bool: 結果が変化した場合はTrue
+        """
+        if result_dict == self._state.get("result"):
+            return False
+        self._state["result"] = result_dict
+        return True
 
     async def astart(self):
         """非同期タスクを開始"""
@@ -157,6 +258,9 @@ class VoskRecognition(BaseRecognition):
         self.pause_event.set()
         if self._task is not None and not self._task.done():
             await self._task
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
 
     async def reset(self):
         """状態をリセット"""
@@ -175,8 +279,7 @@ class VoskRecognition(BaseRecognition):
 
     async def areset_state(self):
         """状態をリセット"""
-        async with self._lock:
-            self._state.clear()
+        self._state.clear()
 
     @property
     def result(self):
@@ -191,6 +294,21 @@ class VoskRecognition(BaseRecognition):
     def audio_queue(self) -> asyncio.Queue:
         return self._audio_queue
 
+    @audio_queue.setter
+    def audio_queue(self, value: asyncio.Queue) -> None:
+        self._audio_queue = value
+
+    @property
+    def callback(self) -> Optional[Callable[[Dict[str, Any]], Any]]:
+        return self._callback
+
+    @callback.setter
+    def callback(self, value: Optional[Callable[[Dict[str, Any]], Any]]) -> None:
+        # 呼び出し方は結果ごとに判定せず、設定時に1回だけ判定する
+        self._callback = value
+        self._callback_is_coro = asyncio.iscoroutinefunction(value)
+        self._callback_is_blocking = value is not None and is_blocking(value)
+
     async def astart_new_session(self):
         """新しい認識セッションを開始"""
         await self.aclear_audio_queue()
@@ -219,7 +337,8 @@ if __name__ == "__main__":
         recognition = VoskRecognition(
             callback=async_recognition_callback, model_path="model"
         )
-        capture = PyAudioCapture([recognition.audio_queue])
+        capture = PyAudioCapture()
+        recognition.audio_queue = capture.create_reader()
         await capture.astart()
         await recognition.astart()
         print("capture started")
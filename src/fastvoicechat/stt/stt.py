@@ -36,9 +36,10 @@ class STT:
         self.vad = vad
 
         # AudioCaptureが指定されていない場合は新規作成
-        self.audio_capture = PyAudioCapture(
-            [self.recognition.audio_queue, self.vad.audio_queue]
-        )
+        # 音声はリングバッファから各コンポーネントの読み手へ配信する
+        self.audio_capture = PyAudioCapture()
+        self.recognition.audio_queue = self.audio_capture.create_reader()
+        self.vad.audio_queue = self.audio_capture.create_reader()
 
     async def astart(self):
         """
@@ -68,7 +69,14 @@ class STT:
         """
         音声入力が開始されたかどうか
         """
-        return self.vad.speech_count > 10
+        return self.speech_started_event.is_set()
+
+    @property
+    def speech_started_event(self) -> asyncio.Event:
+        """
+        音声入力の開始中にセットされるイベント
+        """
+        return self.vad.speech_started_event
 
     @property
     def text(self) -> str:
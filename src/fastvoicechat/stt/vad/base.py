@@ -37,8 +37,14 @@ class BaseVAD(ABC):
         """無音フレームのカウント"""
         pass
 
+    @property
+    @abstractmethod
+    def speech_started_event(self) -> asyncio.Event:
+        """発話開始中にセットされ、発話終了でクリアされるイベント"""
+        pass
+
     @property
     @abstractmethod
     def audio_queue(self) -> asyncio.Queue:
-        """音声データのキュー"""
+        """音声データのキュー（asyncio.Queueと同じget/get_nowait/emptyを持つオブジェクト）"""
         pass
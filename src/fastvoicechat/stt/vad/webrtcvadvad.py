@@ -1,16 +1,20 @@
 import asyncio
 import logging
-import traceback
-from typing import Any, Callable, Coroutine, Dict, Optional
+from typing import Any, Callable, Coroutine, Optional
 
 import webrtcvad
 
+from fastvoicechat.base import aget_until, is_blocking
 from fastvoicechat.stt.vad.base import BaseVAD
 
 # 定数
 RATE = 16000
 VAD_CHUNK = 160
 BYTE_PER_SAMPLE = 2  # 16bit
+# webrtcvadが受け付けるサンプリングレートとフレーム長（ミリ秒）
+SUPPORTED_RATES = (8000, 16000, 32000, 48000)
+SUPPORTED_FRAME_MS = (10, 20, 30)
+MAX_BACKOFF = 1.0  # 処理の失敗が続いたときの最大待機秒数
 
 
 class WebRTCVAD(BaseVAD):
@@ -26,7 +30,18 @@ class WebRTCVAD(BaseVAD):
         max_buffer_size: Optional[int] = None,
         aggressiveness: int = 3,
         padding_duration: float = 0.5,  # 秒
+        speech_start_frames: int = 10,
+        drop_stale: bool = False,
+        max_drop_lag: int = 5,
     ):
+        # 判定ループ内でis_speechが例外を出さないよう、フレームの形式はここで一度だけ検証する
+        if rate not in SUPPORTED_RATES:
+            raise ValueError(f"rate must be one of {SUPPORTED_RATES}, got {rate}")
+        if chunk * 1000 not in tuple(rate * ms for ms in SUPPORTED_FRAME_MS):
+            raise ValueError(
+                f"chunk must be 10, 20 or 30 ms of audio at {rate} Hz, got {chunk}"
+            )
+
         self._audio_queue = audio_queue or asyncio.Queue()
         self.callback = callback
         self.rate = rate
@@ -34,72 +49,144 @@ class WebRTCVAD(BaseVAD):
         self.chunk_bytes = chunk * BYTE_PER_SAMPLE
         self.max_buffer_size = max_buffer_size or chunk * 10
         self.padding_duration = padding_duration
+        self.speech_start_frames = speech_start_frames
+        # 判定が遅れてmax_drop_lagフレームより多く溜まったら、古いフレームを捨てて最新の音声から判定する
+        self.drop_stale = drop_stale
+        self.max_drop_lag = max_drop_lag
 
         # VADの設定
         self.vad = webrtcvad.Vad()
         self.vad.set_mode(aggressiveness)
 
         # パディングフレーム数の計算
-        self.padding_frames = int(padding_duration * 1000 / (chunk / rate * 1000))
+        self.padding_frames = int(padding_duration * rate / chunk)
 
         # 非同期制御
         self.stop_event = asyncio.Event()
         self._task: Optional[asyncio.Task] = None
-        self._state: Dict[str, Any] = {}
-        self._lock = asyncio.Lock()
+        # 状態はarunのタスクからのみ更新するため、ロックを使わずに属性で持つ
+        self._is_speech = False
+        self._silence_count = 0
+        self._speech_count = 0
+        self._speech_started_event = asyncio.Event()
+        self._consecutive_failures = 0
 
     async def arun(self):
         """非同期のメインループ"""
         loop = asyncio.get_running_loop()
-        buffer = b""
+
+        # 受け取った音声は確保済みのバッファに書き込み、読み書きの位置だけを進める
+        # 末尾に入りきらなくなったときだけ未判定の部分を先頭に詰める
+        buffer = bytearray(self.max_buffer_size * 2)
+        view = memoryview(buffer)
+        read_pos = 0
+        write_pos = 0
+
+        def append(frame) -> None:
+            nonlocal read_pos, write_pos
+            size = len(frame)
+            if size > self.max_buffer_size:
+                # 1フレームで上限を超える場合は、末尾だけを残す
+                frame = frame[-self.max_buffer_size :]
+                size = self.max_buffer_size
+                read_pos = write_pos = 0
+            elif write_pos + size > len(buffer):
+                view[: write_pos - read_pos] = view[read_pos:write_pos]
+                write_pos -= read_pos
+                read_pos = 0
+            view[write_pos : write_pos + size] = frame
+            write_pos += size
+
+            # バッファが大きくなりすぎないよう、古い音声を読み飛ばす
+            if write_pos - read_pos > self.max_buffer_size:
+                read_pos = write_pos - self.max_buffer_size
+
+        # 読み手がまとめ読みに対応していれば、1チャンクに足りない分だけをリングバッファから直接連結して受け取る
+        # 対応していなければ、フレームはすぐにbufferへコピーするためコピーなしの取得を使う
+        aread = getattr(self.audio_queue, "aread", None)
+        if aread is not None:
+
+            def aget():
+                return aread(max(self.chunk_bytes - (write_pos - read_pos), 1))
+
+        else:
+            aget = getattr(self.audio_queue, "get_view", self.audio_queue.get)
+
+        # 判定ループで使う値は属性をたどらずに参照する
+        vad_is_speech = self.vad.is_speech
+        chunk_bytes = self.chunk_bytes
+        rate = self.rate
+
+        # 停止の待機はループごとに作らず使い回す
+        stop_waiter = asyncio.create_task(self.stop_event.wait())
 
         try:
             while not self.stop_event.is_set():
                 try:
-                    # 非同期キューからデータを取得
-                    base_frame = await asyncio.wait_for(
-                        self.audio_queue.get(), timeout=0.1
-                    )
-
-                    buffer += base_frame
-                    # バッファが大きくなりすぎないよう制限
-                    if len(buffer) > self.max_buffer_size:
-                        buffer = buffer[-self.max_buffer_size :]  # type: ignore
-
-                    if len(buffer) >= self.chunk_bytes:
-                        # VAD処理は同期APIなのでrun_in_executorで実行
-                        is_speech = await loop.run_in_executor(
-                            None,
-                            lambda: self.vad.is_speech(
-                                buffer[: self.chunk_bytes], self.rate
-                            ),
+                    # 非同期キューからデータを取得（停止されたらNone）
+                    base_frame = await aget_until(aget, [stop_waiter])
+                    if base_frame is None:
+                        break
+
+                    if self.drop_stale and self.audio_queue.qsize() > self.max_drop_lag:
+                        # 1チャンク分の最新フレームだけを残し、途中まで溜めた音声も捨てる
+                        keep = -(-self.chunk_bytes // max(len(base_frame), 1))
+                        dropped = 1
+                        while self.audio_queue.qsize() > keep:
+                            self.audio_queue.get_nowait()
+                            dropped += 1
+                        read_pos = write_pos = 0
+                        logging.debug(f"[WebRTCVAD]: dropped {dropped} stale frames")
+                        continue
+
+                    append(base_frame)
+                    # 既に届いているフレームもまとめて取り込み、溜まった分を1回のループで判定する
+                    while not self.audio_queue.empty():
+                        append(self.audio_queue.get_nowait())
+
+                    # 複数チャンク分届いた場合もすべて判定する
+                    while write_pos - read_pos >= chunk_bytes:
+                        # 1チャンクの判定は数マイクロ秒で終わるため、executorに渡さず直接呼び出す
+                        # webrtcvadは書き込み可能なバッファを受け付けないため、1チャンク分だけコピーする
+                        is_speech = vad_is_speech(
+                            bytes(view[read_pos : read_pos + chunk_bytes]), rate
                         )
 
                         # 状態を更新
-                        await self._aupdate_state(is_speech)
+                        self._update_state(is_speech)
 
                         if self.callback:
                             try:
                                 # コールバックが非同期関数か確認
-                                if asyncio.iscoroutinefunction(self.callback):
+                                if self._callback_is_coro:
                                     await self.callback(is_speech)
-                                else:
+                                elif self._callback_is_blocking:
                                     await loop.run_in_executor(
                                         None, self.callback, is_speech
                                     )
+                                else:
+                                    # 軽い同期処理はスレッドに渡さずそのまま呼び出す
+                                    self.callback(is_speech)
                             except Exception as cb_err:
                                 logging.error(f"VAD callback error: {cb_err}")
 
-                        buffer = buffer[self.chunk_bytes :]
-                except asyncio.TimeoutError:
-                    continue
+                        read_pos += chunk_bytes
+
+                    self._consecutive_failures = 0
                 except Exception as e:
-                    logging.error(f"Error in VAD processing: {e}")
-                    logging.error(traceback.format_exc())
-                    await asyncio.sleep(0.1)  # エラー時に少し待機
+                    logging.exception(f"Error in VAD processing: {e}")
+                    # 失敗が続く場合にログと再試行でイベントループを占有しないよう、間隔を空ける
+                    await self._abackoff()
         except Exception as e:
-            logging.error(f"Error in VAD main loop: {e}")
-            logging.error(traceback.format_exc())
+            logging.exception(f"Error in VAD main loop: {e}")
+        finally:
+            stop_waiter.cancel()
+
+    async def _abackoff(self):
+        """連続した失敗の回数に応じて待機（0.1秒から倍々で最大1秒）"""
+        delay = min(MAX_BACKOFF, 0.1 * 2**self._consecutive_failures)
+        self._consecutive_failures += 1
+        await asyncio.sleep(delay)
 
     async def astart(self):
         """非同期タスクを開始"""
@@ -123,7 +210,7 @@ class WebRTCVAD(BaseVAD):
             is_speech = self.vad.is_speech(audio_data, self.rate)
 
             # 状態更新
-            await self._aupdate_state(is_speech)
+            self._update_state(is_speech)
 
             return is_speech
 
@@ -133,37 +220,64 @@ class WebRTCVAD(BaseVAD):
 
     @property
     def is_speech(self) -> bool:
-        return self._state.get("is_speech", False)
+        return self._is_speech
 
     @property
     def silence_count(self) -> int:
-        return self._state.get("silence_count", 0)
+        return self._silence_count
 
     @property
     def speech_count(self) -> int:
-        return self._state.get("speech_count", 0)
+        return self._speech_count
 
-    async def _aupdate_state(self, is_speech):
+    def _update_state(self, is_speech: bool):
         """状態を更新"""
-        async with self._lock:
-            self._state["is_speech"] = is_speech
-            if is_speech:
-                self._state["silence_count"] = 0
-                self._state["speech_count"] = self._state.get("speech_count", 0) + 1
-            else:
-                self._state["silence_count"] = self._state.get("silence_count", 0) + 1
-                if self._state["silence_count"] > self.padding_frames:
-                    self._state["speech_count"] = 0
+        # 分岐せずに算術だけで更新する
+        # 発話なら無音カウントを0に、発話カウントを+1する
+        # 無音なら無音カウントを+1し、padding_framesを超えたら発話カウントを0にする
+        speech = int(is_speech)
+        self._is_speech = bool(speech)
+        self._silence_count = (self._silence_count + 1) * (1 - speech)
+        self._speech_count = (self._speech_count + speech) * (
+            self._silence_count <= self.padding_frames
+        )
+
+        # 発話開始・終了の遷移をイベントで通知
+        if self._speech_count > self.speech_start_frames:
+            self._speech_started_event.set()
+        else:
+            self._speech_started_event.clear()
 
     async def reset(self):
         """状態をリセット"""
-        async with self._lock:
-            self._state.clear()
+        self._is_speech = False
+        self._silence_count = 0
+        self._speech_count = 0
+        self._speech_started_event.clear()
+
+    @property
+    def speech_started_event(self) -> asyncio.Event:
+        return self._speech_started_event
 
     @property
     def audio_queue(self) -> asyncio.Queue:
         return self._audio_queue
 
+    @audio_queue.setter
+    def audio_queue(self, value: asyncio.Queue) -> None:
+        self._audio_queue = value
+
+    @property
+    def callback(self) -> Optional[Callable[[bool], Any]]:
+        return self._callback
+
+    @callback.setter
+    def callback(self, value: Optional[Callable[[bool], Any]]) -> None:
+        # 呼び出し方は結果ごとに判定せず、設定時に1回だけ判定する
+        self._callback = value
+        self._callback_is_coro = asyncio.iscoroutinefunction(value)
+        self._callback_is_blocking = value is not None and is_blocking(value)
+
 
 if __name__ == "__main__":
     from fastvoicechat.stt.capture import PyAudioCapture
@@ -173,7 +287,8 @@ if __name__ == "__main__":
 
     async def async_main_with_monitoring():
         vad = WebRTCVAD(callback=async_vad_callback)
-        capture = PyAudioCapture([vad.audio_queue])
+        capture = PyAudioCapture()
+        vad.audio_queue = capture.create_reader()
         await capture.astart()
         await vad.astart()
         print("capture started")
@@ -0,0 +1,153 @@
+import io
+import struct
+import threading
+import wave
+from collections import OrderedDict
+from typing import NamedTuple, Optional, Tuple
+
+import numpy as np
+
+# デコード結果を保持するWAVの数
+WAV_CACHE_SIZE = 64
+# デコード結果を保持するWAVの合計の最大バイト数（長い一度きりの発話で音声を抱え込まないように）
+WAV_CACHE_MAX_BYTES = 8 * 1024 * 1024
+
+# リニアPCMを表すfmtチャンクのフォーマットID
+WAVE_FORMAT_PCM = 1
+
+# サンプル幅（バイト）ごとのNumPyのdtype
+_DTYPES = {
+    1: np.uint8,  # 8-bit
+    2: np.int16,  # 16-bit
+    4: np.int32,  # 32-bit
+}
+
+
+class WavData(NamedTuple):
+    """デコードしたWAV音声"""
+
+    frames: memoryview
+    channels: int
+    sample_width: int
+    sample_rate: int
+
+    @property
+    def duration(self) -> float:
+        """再生時間（秒）"""
+        return len(self.frames) / (self.channels * self.sample_width * self.sample_rate)
+
+
+def _parse_wav(content: bytes) -> Optional[WavData]:
+    """
+    RIFFのチャンクを直接読み、dataチャンクをコピーせずに参照する
+
+    Args:
+        content: WAV音声のバイト列
+
+    Returns:
+        Optional[WavData]: リニアPCM以外など、解析できない場合はNone
+    """
+    if len(content) < 12 or content[:4] != b"RIFF" or content[8:12] != b"WAVE":
+        return None
+
+    fmt = None
+    pos = 12
+    while pos + 8 <= len(content):
+        chunk_id, chunk_size = struct.unpack_from("<4sI", content, pos)
+        body = pos + 8
+        if chunk_id == b"fmt " and chunk_size >= 16 and body + 16 <= len(content):
+            fmt = struct.unpack_from("<HHIIHH", content, body)
+        elif chunk_id == b"data":
+            if fmt is None or fmt[0] != WAVE_FORMAT_PCM or fmt[4] == 0:
+                return None
+            _, channels, sample_rate, _, block_align, bits = fmt
+            # サイズが実際より大きい（ストリーミング出力など）場合はあるところまで読む
+            size = min(chunk_size, len(content) - body)
+            size -= size % block_align
+            return WavData(
+                frames=memoryview(content)[body : body + size],
+                channels=channels,
+                sample_width=(bits + 7) // 8,
+                sample_rate=sample_rate,
+            )
+        # チャンクは2バイト境界に揃えられる
+        pos = body + chunk_size + (chunk_size & 1)
+    return None
+
+
+# バイト列をキーにしたデコード結果のLRUキャッシュ（プレイヤーのスレッドからも呼ばれるためロックで保護する）
+_cache: "OrderedDict[bytes, Tuple[WavData, int]]" = OrderedDict()
+_cache_bytes = 0
+_cache_lock = threading.Lock()
+
+
+def decode_wav(content: bytes) -> WavData:
+    """
+    WAV音声のバイト列をデコード
+
+    同じ音声（定型の応答など）を繰り返し再生するときにヘッダーの解析をやり直さないよう、
+    バイト列をキーに結果をキャッシュします。キャッシュは件数と合計バイト数で制限し、
+    上限を超える大きな音声はキャッシュしません。
+
+    Args:
+        content: WAV音声のバイト列
+
+    Returns:
+        WavData: PCMデータ（元のバイト列を参照するmemoryview）とフォーマット
+    """
+    global _cache_bytes
+
+    with _cache_lock:
+        cached = _cache.get(content)
+        if cached is not None:
+            _cache.move_to_end(content)
+            return cached[0]
+
+    wav = _parse_wav(content)
+    size = len(content)
+    if wav is None:
+        # 直接解析できない形式はwaveモジュールで読む（PCMはコピーになる）
+        with wave.open(io.BytesIO(content), "rb") as wf:
+            wav = WavData(
+                frames=memoryview(wf.readframes(wf.getnframes())),
+                channels=wf.getnchannels(),
+                sample_width=wf.getsampwidth(),
+                sample_rate=wf.getframerate(),
+            )
+        size += len(wav.frames)
+
+    if size > WAV_CACHE_MAX_BYTES:
+        return wav
+
+    with _cache_lock:
+        old = _cache.pop(content, None)
+        if old is not None:
+            _cache_bytes -= old[1]
+        _cache[content] = (wav, size)
+        _cache_bytes += size
+        while len(_cache) > WAV_CACHE_SIZE or _cache_bytes > WAV_CACHE_MAX_BYTES:
+            _, (_, evicted_size) = _cache.popitem(last=False)
+            _cache_bytes -= evicted_size
+    return wav
+
+
+def decode_wav_array(content: bytes) -> Tuple[np.ndarray, int]:
+    """
+    WAV音声のバイト列を(フレーム数, チャンネル数)の配列にデコード
+
+    配列はPCMデータを参照するビューのため、2つ目のコピーとしてはキャッシュしません。
+
+    Args:
+        content: WAV音声のバイト列
+
+    Returns:
+        Tuple[np.ndarray, int]: 読み取り専用の音声データとサンプリングレート
+    """
+    wav = decode_wav(content)
+    dtype = _DTYPES.get(wav.sample_width)
+    if dtype is None:
+        raise ValueError(f"Unsupported sample width: {wav.sample_width}")
+
+    # 1チャンネルの場合も2次元配列にする
+    audio_data = np.frombuffer(wav.frames, dtype=dtype).reshape(-1, wav.channels)
+    return audio_data, wav.sample_rate
@@ -26,6 +26,39 @@ class BasePlayer(ABC):
         """
         pass
 
+    async def _await_playback(
+        self, playback: asyncio.Future, interrupt_event: Optional[asyncio.Event]
+    ) -> bool:
+        """
+        再生の完了と中断のどちらか早い方まで待機する。
+
+        一定間隔で再生状態を確認する代わりに、再生の完了を表すFutureと中断イベントを同時に待ちます。
+
+        Args:
+            playback: 再生が完了すると完了するFuture
+            interrupt_event: 再生を中断するためのイベント
+
+        Returns:
+            bool: 再生が完了したかどうか（Falseなら中断された）
+        """
+        if interrupt_event is None:
+            await playback
+            return True
+
+        interrupt_waiter = asyncio.create_task(interrupt_event.wait())
+        try:
+            await asyncio.wait(
+                {playback, interrupt_waiter}, return_when=asyncio.FIRST_COMPLETED
+            )
+        finally:
+            interrupt_waiter.cancel()
+
+        if playback.done():
+            # 再生中の例外は呼び出し元に伝える
+            playback.result()
+            return True
+        return False
+
     @abstractmethod
     async def astop(self) -> None:
         """再生停止の実装（サブクラスで実装）"""
@@ -1,13 +1,35 @@
 import asyncio
+import atexit
 import io
+import logging
+import threading
 import wave
-from typing import Optional
+from typing import Dict, Optional, Tuple
 
 import numpy as np
 import pyaudio
 
+from fastvoicechat.tts.players._wavcache import decode_wav
 from fastvoicechat.tts.players.base import BasePlayer
 
+# すべてのPyAudioPlayerで共有するPyAudioインスタンス（初回使用時に初期化）
+_pyaudio_instance: Optional[pyaudio.PyAudio] = None
+_pyaudio_lock = threading.Lock()
+
+
+def _get_pyaudio() -> pyaudio.PyAudio:
+    """共有のPyAudioインスタンスを取得
+
+    PortAudioの初期化とデバイスの検出はプレイヤーごとに行わず、初回呼び出し時に一度だけ行います。
+    インスタンスはプロセス終了時に終了します。
+    """
+    global _pyaudio_instance
+    with _pyaudio_lock:
+        if _pyaudio_instance is None:
+            _pyaudio_instance = pyaudio.PyAudio()
+            atexit.register(_pyaudio_instance.terminate)
+    return _pyaudio_instance
+
 
 class PyAudioPlayer(BasePlayer):
     """PyAudioを使った非同期オーディオプレイヤー"""
@@ -15,8 +37,12 @@ class PyAudioPlayer(BasePlayer):
     def __init__(self, interval: float = 0.01, **kwargs):
         super().__init__(interval)
         self._lock = asyncio.Lock()
-        self._pyaudio = pyaudio.PyAudio()
+        self._pyaudio = _get_pyaudio()
         self._stream = None
+        # フォーマット(sample_width, channels, sample_rate)ごとに開いたストリームを使い回す
+        self._streams: Dict[Tuple[int, int, int], pyaudio.Stream] = {}
+        # 中断後の書き込みが終わる前に、同じストリームへ次の書き込みをしないようにする
+        self._write_lock = threading.Lock()
 
     async def aplay_voice(
         self, content: bytes, interrupt_event: Optional[asyncio.Event] = None
@@ -31,61 +57,63 @@ class PyAudioPlayer(BasePlayer):
         Returns:
             bool: 正常終了したかどうか（Falseなら中断された）
         """
-        async with self._lock:
-            # 既存の再生があれば停止
-            if self.is_playing:
-                await self.astop()
+        # 既存の再生があれば停止（astopがロックを取るため、ここではロックを取らない）
+        if self.is_playing:
+            await self.astop()
 
+        key = None
         try:
-            # WAVデータを解析
-            wav_io = io.BytesIO(content)
-            with wave.open(wav_io, "rb") as wf:
-                channels = wf.getnchannels()
-                sample_width = wf.getsampwidth()
-                sample_rate = wf.getframerate()
-                frames = wf.readframes(wf.getnframes())
-
-            # ストリームを開く
-            async with self._lock:
-                self._stream = self._pyaudio.open(
-                    format=self._pyaudio.get_format_from_width(sample_width),
-                    channels=channels,
-                    rate=sample_rate,
-                    output=True,
-                )
-
-            # 音声データを書き込む
-            async def _aplay():
-                loop = asyncio.get_event_loop()
-                if self._stream is not None:
-                    await loop.run_in_executor(None, self._stream.write, frames)
-                    self._stream.stop_stream()
+            # WAVデータを解析（同じ音声はキャッシュから取得）
+            wav = decode_wav(content)
+            frames = wav.frames
+            key = (wav.sample_width, wav.channels, wav.sample_rate)
 
-            asyncio.create_task(_aplay())
-
-            # 再生が終了するまで待機
-            while self._stream.is_active():
-                if interrupt_event is not None and interrupt_event.is_set():
-                    await self.astop()
-                    return False
-                await asyncio.sleep(self.interval)
+            # 同じフォーマットのストリームがあれば使い回し、なければ開く
+            async with self._lock:
+                stream = self._streams.get(key)
+                if stream is None:
+                    stream = self._pyaudio.open(
+                        format=self._pyaudio.get_format_from_width(wav.sample_width),
+                        channels=wav.channels,
+                        rate=wav.sample_rate,
+                        output=True,
+                    )
+                    self._streams[key] = stream
+                elif stream.is_stopped():
+                    stream.start_stream()
+                self._stream = stream
+
+            # 音声データを書き込む（書き込みと出力の完了までexecutorでブロックする）
+            def _play():
+                with self._write_lock:
+                    stream.write(frames)
+                    if self._stream is stream:
+                        stream.stop_stream()
+
+            # 再生が終了するか中断されるまで待機
+            playback = asyncio.get_running_loop().run_in_executor(None, _play)
+            if not await self._await_playback(playback, interrupt_event):
+                await self.astop()
+                return False
 
             return True
 
         except Exception as e:
-            print(f"Error in play_voice: {e}")
+            logging.error(f"Error in play_voice: {e}")
             await self.astop()
+            # 異常が起きたストリームは使い回さない
+            if key is not None:
+                self._close_stream(self._streams.pop(key, None))
             return False
 
     async def astop(self) -> None:
-        """再生を停止する"""
+        """再生を停止する（ストリームは次の再生で使い回すため閉じない）"""
         async with self._lock:
             if self._stream is not None and not self._stream.is_stopped():
                 try:
                     # pyaudioのストリーム停止は標準的なやり方がなさそう
                     # エラーが出るが中断はできるようなのでこれでいく
                     self._stream.stop_stream()
-                    self._stream.close()
                 finally:
                     self._stream = None
 
@@ -94,10 +122,27 @@ class PyAudioPlayer(BasePlayer):
         """再生中かどうかを返す"""
         return self._stream is not None and self._stream.is_active()
 
+    @staticmethod
+    def _close_stream(stream: Optional["pyaudio.Stream"]) -> None:
+        """ストリームを閉じる（失敗しても無視する）"""
+        if stream is None:
+            return
+        try:
+            stream.close()
+        except Exception as e:
+            logging.debug(f"[PyAudioPlayer]: failed to close stream: {e}")
+
+    def close(self) -> None:
+        """使い回しているストリームをすべて閉じる"""
+        self._stream = None
+        streams, self._streams = list(self._streams.values()), {}
+        for stream in streams:
+            self._close_stream(stream)
+
     def __del__(self):
-        """PyAudioインスタンスを終了する"""
-        if hasattr(self, "_pyaudio"):
-            self._pyaudio.terminate()
+        """ストリームを閉じる（共有のPyAudioインスタンスは終了しない）"""
+        if hasattr(self, "_streams"):
+            self.close()
 
 
 if __name__ == "__main__":
@@ -1,11 +1,13 @@
 import asyncio
 import io
+import logging
 import wave
 from typing import Optional
 
 import numpy as np
 import simpleaudio
 
+from fastvoicechat.tts.players._wavcache import decode_wav
 from fastvoicechat.tts.players.base import BasePlayer
 
 
@@ -31,37 +33,35 @@ class SimpleAudioPlayer(BasePlayer):
             bool: 正常終了したかどうか（Falseなら中断された）
         """
         async with self._lock:
-            # 既存の再生があれば停止
+            # 既存の再生があれば停止（ロックを保持したままなのでastopは呼ばない）
             if self.play_obj is not None:
-                await self.astop()
-
-            # WAVデータをNumPy配列に変換
-            wav_io = io.BytesIO(content)
-            with wave.open(wav_io, "rb") as wf:
-                channels = wf.getnchannels()
-                sample_width = wf.getsampwidth()
-                sample_rate = wf.getframerate()
-                raw_data = wf.readframes(wf.getnframes())
+                self.play_obj.stop()
+                self.play_obj = None
 
-            audio_data = np.frombuffer(raw_data, dtype=np.int16)
+            # WAVデータをNumPy配列に変換（同じ音声はキャッシュから取得）
+            wav = decode_wav(content)
+            audio_data = np.frombuffer(wav.frames, dtype=np.int16)
 
             # 再生開始
             self.play_obj = simpleaudio.play_buffer(
-                audio_data, channels, sample_width, sample_rate
+                audio_data, wav.channels, wav.sample_width, wav.sample_rate
             )
 
+            play_obj = self.play_obj
+
         # 再生が終了するか中断されるまで待機
         try:
-            # 中断イベントがある場合は、それを監視しながら再生終了を待つ
-            while self.is_playing:
-                if interrupt_event is not None and interrupt_event.is_set():
-                    await self.astop()
-                    return False
-                await asyncio.sleep(self.interval)
+            # 再生終了はexecutorで待ち、中断イベントと同時に待機する（停止するとwait_doneも戻る）
+            playback = asyncio.get_running_loop().run_in_executor(
+                None, play_obj.wait_done
+            )
+            if not await self._await_playback(playback, interrupt_event):
+                await self.astop()
+                return False
 
             return True
         except Exception as e:
-            print(f"Error in play_voice: {e}")
+            logging.error(f"Error in play_voice: {e}")
             await self.astop()
             return False
 
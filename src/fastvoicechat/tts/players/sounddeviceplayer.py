@@ -1,20 +1,55 @@
 import asyncio
 import io
+import logging
+import threading
 import wave
-from typing import Optional
+from typing import Callable, Optional, Tuple
 
 import numpy as np
 import sounddevice as sd
 
+from fastvoicechat.tts.players._wavcache import decode_wav
 from fastvoicechat.tts.players.base import BasePlayer
 
+# サンプル幅（バイト）ごとのsounddeviceのdtype
+_DTYPES = {
+    1: "uint8",  # 8-bit
+    2: "int16",  # 16-bit
+    3: "int24",  # 24-bit
+    4: "int32",  # 32-bit
+}
+
 
 class SoundDevicePlayer(BasePlayer):
-    """sounddeviceを使った非同期オーディオプレイヤー"""
+    """
+    sounddeviceを使った非同期オーディオプレイヤー
+
+    出力ストリームは発話ごとに開閉せず開いたままにし、再生するPCMデータだけを差し替えます。
+    再生していない間、コールバックは無音を出力します。
+    """
 
-    def __init__(self, interval: float = 0.01, **kwargs):
+    def __init__(self, interval: float = 0.01, blocksize: int = 0, **kwargs):
+        """
+        Args:
+            interval: 状態確認の間隔（秒）
+            blocksize: 1回のコールバックで出力するフレーム数（0ならPortAudioに任せる）
+                固定すると、コールバックごとの出力サイズが揃い、無音のバッファをストリームを開くときに確保できる
+        """
         super().__init__(interval)
+        self.blocksize = blocksize
         self._lock = asyncio.Lock()
+        # 開いたままにする出力ストリームと、そのフォーマット(sample_rate, channels, sample_width)
+        self._stream: Optional[sd.RawOutputStream] = None
+        self._stream_key: Optional[Tuple[int, int, int]] = None
+        self._bytes_per_frame = 0
+        # 無音として出力するバイト列（必要な長さになるまで伸ばして使い回す）
+        self._silence = memoryview(b"")
+        self._silence_value = 0
+        # 再生中のPCMデータと読み出し位置、再生終了の通知先（コールバックと共有するためロックで保護する）
+        self._buffer_lock = threading.Lock()
+        self._raw: Optional[memoryview] = None
+        self._raw_pos = 0
+        self._on_finished: Optional[Callable[[bool], None]] = None
 
     async def aplay_voice(
         self, content: bytes, interrupt_event: Optional[asyncio.Event] = None
@@ -29,71 +64,148 @@ class SoundDevicePlayer(BasePlayer):
         Returns:
             bool: 正常終了したかどうか（Falseなら中断された）
         """
-        async with self._lock:
-            # 既存の再生があれば停止
-            if self.is_playing:
-                await self.astop()
+        # 既存の再生があれば停止（astopがロックを取るため、ここではロックを取らない）
+        if self.is_playing:
+            await self.astop()
 
-            # WAVデータをNumPy配列に変換
-            wav_io = io.BytesIO(content)
-            with wave.open(wav_io, "rb") as wf:
-                channels = wf.getnchannels()
-                sample_width = wf.getsampwidth()
-                sample_rate = wf.getframerate()
-                frames = wf.getnframes()
-                raw_data = wf.readframes(frames)
-
-                if sample_width == 1:  # 8-bit
-                    dtype = np.uint8
-                elif sample_width == 2:  # 16-bit
-                    dtype = np.int16
-                elif sample_width == 4:  # 32-bit
-                    dtype = np.int32
-                else:
-                    raise ValueError(f"Unsupported sample width: {sample_width}")
-
-                audio_data = np.frombuffer(raw_data, dtype=dtype)
-                # 1チャンネルの場合も2次元配列にする
-                if channels > 1:
-                    audio_data = audio_data.reshape(-1, channels)
-                else:
-                    audio_data = audio_data.reshape(-1, 1)
-
-            # 再生開始（sd.playは非同期的に動作する）
-            sd.play(audio_data, sample_rate, blocking=False)
-
-        # 中断イベントがある場合は、それを監視しながら再生終了を待つ
         try:
-            # 割り込みイベントを監視しながら再生終了を待つ
-            while self.is_playing:
-                if interrupt_event is not None and interrupt_event.is_set():
-                    await self.astop()
-                    return False
-                await asyncio.sleep(self.interval)
-
-            return True
+            # WAVデータを解析（同じ音声はキャッシュから取得）
+            # NumPy配列には変換せず、PCMのバイト列をそのままコールバックで出力する
+            wav = decode_wav(content)
+
+            # 再生の終了はPortAudioのスレッドから、停止はastopから通知される
+            # （結果は最後まで再生したかどうか）
+            loop = asyncio.get_running_loop()
+            playback = loop.create_future()
+
+            def _set_finished(completed: bool):
+                if not playback.done():
+                    playback.set_result(completed)
+
+            def _on_finished(completed: bool):
+                try:
+                    loop.call_soon_threadsafe(_set_finished, completed)
+                except RuntimeError:
+                    # イベントループが既に閉じられている場合は何もしない
+                    pass
+
+            async with self._lock:
+                self._ensure_stream(wav.sample_rate, wav.channels, wav.sample_width)
+                # 次のコールバックから新しい音声が出力される
+                with self._buffer_lock:
+                    replaced = self._on_finished
+                    self._raw = wav.frames
+                    self._raw_pos = 0
+                    self._on_finished = _on_finished
+                # 差し替えられた再生を待っている呼び出しは中断として終わらせる
+                if replaced is not None:
+                    replaced(False)
+                # 開いたばかりのストリームは、音声を差し替えてから開始して無音を挟まない
+                if not self._stream.active:
+                    self._stream.start()
+
+            # 再生が終了するか中断されるまで待機
+            if not await self._await_playback(playback, interrupt_event):
+                await self.astop()
+                return False
+
+            # 他のタスクからastopされた場合はFalse
+            return playback.result()
+
         except Exception as e:
-            print(f"Error in play_voice: {e}")
+            logging.error(f"Error in play_voice: {e}")
             await self.astop()
             return False
 
+    def _ensure_stream(
+        self, sample_rate: int, channels: int, sample_width: int
+    ) -> None:
+        """指定したフォーマットの出力ストリームを用意する（同じフォーマットで動いていれば使い回す）"""
+        key = (sample_rate, channels, sample_width)
+        if self._stream is not None and self._stream_key == key and self._stream.active:
+            return
+
+        dtype = _DTYPES.get(sample_width)
+        if dtype is None:
+            raise ValueError(f"Unsupported sample width: {sample_width}")
+
+        # フォーマットが異なるか、ストリームが止まっていれば開き直す
+        self.close()
+        self._bytes_per_frame = channels * sample_width
+        # 8-bitのPCMは符号なしのため、無音は0x80
+        self._silence_value = 0x80 if sample_width == 1 else 0
+        # ブロックサイズが決まっていれば、無音のバッファを先に確保しておく
+        self._silence = memoryview(
+            bytes([self._silence_value]) * (self.blocksize * self._bytes_per_frame)
+        )
+        self._stream_key = key
+        self._stream = sd.RawOutputStream(
+            samplerate=sample_rate,
+            blocksize=self.blocksize,
+            channels=channels,
+            dtype=dtype,
+            callback=self._callback,
+        )
+
+    def _callback(self, outdata, frames: int, time, status) -> None:
+        """PCMデータを出力バッファへコピーする（PortAudioのスレッドから呼ばれる）"""
+        nbytes = frames * self._bytes_per_frame
+        if len(self._silence) < nbytes:
+            self._silence = memoryview(bytes([self._silence_value]) * nbytes)
+
+        on_finished: Optional[Callable[[bool], None]] = None
+        with self._buffer_lock:
+            raw = self._raw
+            if raw is None:
+                # 最後のブロックがデバイスに渡った後で再生終了を通知する
+                size = 0
+                on_finished = self._on_finished
+                self._on_finished = None
+            else:
+                start = self._raw_pos
+                chunk = raw[start : start + nbytes]
+                size = len(chunk)
+                outdata[:size] = chunk
+                self._raw_pos = start + size
+                if size < nbytes:
+                    # 最後まで出力したら、以降は無音を出力する
+                    self._raw = None
+
+        if size < nbytes:
+            outdata[size:nbytes] = self._silence[: nbytes - size]
+        if on_finished is not None:
+            on_finished(True)
+
     async def astop(self) -> None:
-        """再生を停止する"""
+        """再生を停止する（ストリームは次の再生で使い回すため閉じない）"""
         async with self._lock:
-            if self.is_playing:
-                # sd.stopは非同期的に動作する
-                sd.stop()
+            with self._buffer_lock:
+                on_finished = self._on_finished
+                self._raw = None
+                self._on_finished = None
+            # 再生の完了を待っている呼び出しは中断として終わらせる
+            if on_finished is not None:
+                on_finished(False)
+
+    def close(self) -> None:
+        """開いたままの出力ストリームを閉じる"""
+        stream, self._stream = self._stream, None
+        self._stream_key = None
+        if stream is not None:
+            try:
+                stream.close()
+            except Exception as e:
+                logging.debug(f"[SoundDevicePlayer]: failed to close stream: {e}")
 
     @property
     def is_playing(self) -> bool:
         """再生中かどうかを返す"""
-        try:
-            stream = sd.get_stream()
-            if stream is None:
-                return False
-            return stream.active
-        except Exception:
-            return False
+        return self._raw is not None or self._on_finished is not None
+
+    def __del__(self):
+        """出力ストリームを閉じる"""
+        if hasattr(self, "_stream"):
+            self.close()
 
 
 if __name__ == "__main__":
@@ -27,14 +27,24 @@ TCPIPPlayerは以下の仕様のサーバーと通信することを想定して
 
 import asyncio
 import io
-import socket
+import logging
+import struct
+import time
 import wave
-from typing import Optional
+from typing import Optional, Tuple
 
 import numpy as np
 
+from fastvoicechat.tts.players._wavcache import decode_wav
 from fastvoicechat.tts.players.base import BasePlayer
 
+# メッセージの先頭に付けるサイズ（big endianの32bit整数）
+_SIZE = struct.Struct(">I")
+
+# コマンドは毎回組み立てず、サイズを付けたメッセージを用意しておく
+_PLAY_WAV = _SIZE.pack(len(b"play_wav")) + b"play_wav"
+_STOP_WAV = _SIZE.pack(len(b"stop_wav")) + b"stop_wav"
+
 
 class TCPIPPlayer(BasePlayer):
     """TCP/IPを使用した非同期プレイヤー（クライアント）"""
@@ -44,33 +54,116 @@ class TCPIPPlayer(BasePlayer):
         host: str = "localhost",
         port: int = 12345,
         interval: float = 0.01,
+        keep_alive: bool = False,
         **kwargs,
     ):
+        """
+        Args:
+            host: サーバーのホスト名
+            port: サーバーのポート番号
+            interval: 再生状態を確認する間隔（秒）
+            keep_alive: 接続を閉じずに次のコマンドでも使い回すかどうか
+                1つの接続で複数のコマンドを受け付けるサーバーでのみ有効にしてください
+        """
         super().__init__(interval)
         self.host = host
         self.port = port
+        self.keep_alive = keep_alive
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        # サーバーから届いたデータを読み捨てるタスク（終了していれば接続は切断済み）
+        self._drain_task: Optional[asyncio.Task] = None
         self._play_start_time: Optional[float] = None
         self._play_duration: Optional[float] = None
 
-    def __connect(self) -> socket.socket:
-        """サーバーに接続する"""
-        conn = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        conn.connect((self.host, self.port))
-        return conn
+    async def __aconnect(
+        self,
+    ) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        """サーバーに接続する（短いコマンドが待たされないよう、asyncioがTCP_NODELAYを設定する）"""
+        return await asyncio.open_connection(self.host, self.port)
+
+    async def __asend(self, writer: asyncio.StreamWriter, *buffers: bytes) -> None:
+        """
+        サイズを付けたメッセージを送信する
+
+        サイズとデータを別々に書き込まず、すべてのバッファをまとめて1回で書き込み、
+        サイズだけの小さなセグメントが送られないようにします。
+        """
+        writer.writelines(buffers)
+        await writer.drain()
+
+    @staticmethod
+    async def __adrain(reader: asyncio.StreamReader) -> None:
+        """
+        サーバーから届いたデータを読み捨てる
 
-    def __send(self, conn: socket.socket, data: bytes) -> None:
-        """データを送信する"""
-        size = len(data)
-        conn.send(size.to_bytes(4, byteorder="big"))
-        conn.send(data)
+        読まずに溜めるとEOFを検出できず、受信バッファが溢れると送信も止まるため、
+        使い回す接続では常に読み続けます。
+        """
+        try:
+            while await reader.read(4096):
+                pass
+        except Exception as e:
+            logging.debug(f"[TCPIPPlayer]: connection lost: {e}")
 
-    def __close(self, conn: socket.socket) -> None:
+    async def __aclose(self, writer: asyncio.StreamWriter) -> None:
         """接続を閉じる"""
         try:
-            conn.shutdown(1)
-            conn.close()
+            if writer.can_write_eof():
+                writer.write_eof()
+            writer.close()
+            await writer.wait_closed()
         except Exception as e:
-            print(f"Error in close: {e}")
+            logging.error(f"Error in close: {e}")
+
+    async def __arequest(self, *buffers: bytes) -> None:
+        """コマンドを送信する（keep_aliveなら接続を使い回し、切断されていればつなぎ直す）"""
+        if not self.keep_alive:
+            _, writer = await self.__aconnect()
+            try:
+                await self.__asend(writer, *buffers)
+            finally:
+                await self.__aclose(writer)
+            return
+
+        for retry in (False, True):
+            # サーバーが接続を閉じていれば（EOFを受信済み）、書き込む前につなぎ直す
+            # 閉じられた接続への書き込みは、エラーにならずに失われることがある
+            reader, writer = self._reader, self._writer
+            if (
+                reader is None
+                or writer is None
+                or writer.is_closing()
+                or reader.at_eof()
+                or self._drain_task is None
+                or self._drain_task.done()
+            ):
+                self.close()
+                reader, writer = await self.__aconnect()
+                self._reader, self._writer = reader, writer
+                self._drain_task = asyncio.create_task(self.__adrain(reader))
+            try:
+                await self.__asend(writer, *buffers)
+                return
+            except OSError:
+                # 書き込み中に切断された場合は、つなぎ直して送り直す
+                self.close()
+                if retry:
+                    raise
+
+    def close(self) -> None:
+        """使い回している接続を閉じる"""
+        writer, self._writer = self._writer, None
+        drain_task, self._drain_task = self._drain_task, None
+        self._reader = None
+        try:
+            if drain_task is not None:
+                drain_task.cancel()
+            if writer is not None:
+                writer.close()
+        except RuntimeError:
+            # イベントループが既に閉じられている場合は何もしない
+            pass
 
     async def aplay_voice(
         self, content: bytes, interrupt_event: Optional[asyncio.Event] = None
@@ -87,48 +180,38 @@ class TCPIPPlayer(BasePlayer):
         """
         try:
             # サーバーに接続して音声データを送信
-            print("DEBUG: サーバーに接続して音声データを送信")
-            conn = self.__connect()
-            self.__send(conn, b"play_wav")  # コマンドを送信
-            self.__send(conn, content)  # WAVデータを送信
-            self.__close(conn)
-
-            # WAVデータの長さを取得して、その時間分待機
-            print("DEBUG: WAVデータの長さを取得")
-            wav_io = io.BytesIO(content)
-            with wave.open(wav_io, "rb") as wf:
-                duration = wf.getnframes() / wf.getframerate()
-            print(f"DEBUG: duration = {duration}")
+            logging.debug("[TCPIPPlayer]: サーバーに接続して音声データを送信")
+            # コマンドとWAVデータを送信
+            await self.__arequest(_PLAY_WAV, _SIZE.pack(len(content)), content)
+
+            # WAVデータの長さを取得して、その時間分待機（同じ音声はキャッシュから取得）
+            duration = decode_wav(content).duration
+            logging.debug(f"[TCPIPPlayer]: duration = {duration}")
 
             # 再生開始時刻と再生時間を記録
-            self._play_start_time = asyncio.get_event_loop().time()
+            # イベントループの時計は参照せず、ループ外からも読めるtime.monotonicを使う
+            self._play_start_time = time.monotonic()
             self._play_duration = duration
-            print(
-                "DEBUG: 再生開始時刻と再生時間を記録",
-                self._play_start_time,
-                self._play_duration,
-            )
-
-            # 再生時間分待機（中断可能）
-            while (asyncio.get_event_loop().time() - self._play_start_time) < duration:
-                print(
-                    f"DEBUG: 再生時間 = {asyncio.get_event_loop().time() - self._play_start_time}"
-                )
-                if interrupt_event is not None and interrupt_event.is_set():
-                    print("DEBUG: 中断イベントを検出")
-                    await self.astop()
-                    return False
-                await asyncio.sleep(self.interval)
-                print("DEBUG: 待機中...")
+
+            # 再生時間が経過するか中断されるまで待機（一定間隔で確認せず、中断イベントを直接待つ）
+            playback = asyncio.ensure_future(asyncio.sleep(duration))
+            try:
+                completed = await self._await_playback(playback, interrupt_event)
+            finally:
+                playback.cancel()
+            if not completed:
+                logging.debug("[TCPIPPlayer]: 中断イベントを検出")
+                await self.astop()
+                return False
 
             # 再生終了
-            print("DEBUG: 再生終了")
+            logging.debug("[TCPIPPlayer]: 再生終了")
             self._play_start_time = None
             self._play_duration = None
             return True
 
         except Exception as e:
-            print(f"Error in play_voice: {e}")
+            logging.error(f"Error in play_voice: {e}")
             self._play_start_time = None
             self._play_duration = None
             return False
@@ -136,22 +219,25 @@ class TCPIPPlayer(BasePlayer):
     async def astop(self) -> None:
         """再生を停止する"""
         try:
-            conn = self.__connect()
-            self.__send(conn, b"stop_wav")
-            self.__close(conn)
+            await self.__arequest(_STOP_WAV)
             self._play_start_time = None
             self._play_duration = None
         except Exception as e:
-            print(f"Error in stop: {e}")
+            logging.error(f"Error in stop: {e}")
 
     @property
     def is_playing(self) -> bool:
         """再生中かどうかを返す"""
         if self._play_start_time is None or self._play_duration is None:
             return False
-        current_time = asyncio.get_event_loop().time()
+        current_time = time.monotonic()
         return (current_time - self._play_start_time) < self._play_duration
 
+    def __del__(self):
+        """使い回している接続を閉じる"""
+        if getattr(self, "_writer", None) is not None:
+            self.close()
+
 
 if __name__ == "__main__":
 
@@ -1,17 +1,62 @@
-import io
+import asyncio
+import struct
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
 
 import numpy as np
 import pyopenjtalk
-from scipy.io import wavfile
 
 from fastvoicechat.tts.synthesizers.base import BaseSynthesizer
 
+# 16bitモノラルのリニアPCMのWAVヘッダー（44バイト）
+_WAV_HEADER = struct.Struct("<4sI4s4sIHHIIHH4sI")
+
+
+def _wrap_pcm16_mono(samples: np.ndarray, sample_rate: int) -> bytes:
+    """
+    音声サンプルを16bitモノラルのWAVバイト列に変換
+
+    Args:
+        samples: 音声サンプル
+        sample_rate: サンプリングレート
+
+    Returns:
+        bytes: WAV形式の音声データ
+    """
+    pcm = samples.astype(np.int16, copy=False).tobytes()
+    header = _WAV_HEADER.pack(
+        b"RIFF",
+        36 + len(pcm),
+        b"WAVE",
+        b"fmt ",
+        16,  # fmtチャンクのサイズ
+        1,  # リニアPCM
+        1,  # チャンネル数
+        sample_rate,
+        sample_rate * 2,  # 1秒あたりのバイト数
+        2,  # 1フレームのバイト数
+        16,  # 量子化ビット数
+        b"data",
+        len(pcm),
+    )
+    return header + pcm
+
 
 class PyOpenJTalkSynthesizer(BaseSynthesizer):
     """pyopenjtalkを非同期で扱うクラス"""
 
     def __init__(self, **kwargs):
-        pass
+        # 合成を順番に実行する専用スレッド（OpenJTalkの呼び出しを並行させず、既定のexecutorとも共有しない）
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """合成処理を実行する専用のexecutor"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="pyopenjtalk"
+            )
+        return self._executor
 
     async def asynthesize(self, text: str) -> bytes:
         """
@@ -23,15 +68,22 @@ class PyOpenJTalkSynthesizer(BaseSynthesizer):
         Returns:
             bytes: WAV形式の音声データ
         """
+        # 合成は同期的で時間がかかるため、イベントループを止めないよう専用スレッドで実行
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, self._synthesize, text)
+
+    @staticmethod
+    def _synthesize(text: str) -> bytes:
+        """テキストを合成してWAVバイト列に変換（専用スレッドで実行）"""
         x, sr = pyopenjtalk.tts(text)
-        # numpy配列をwavバイトに変換
-        wav_buffer = io.BytesIO()
-        wavfile.write(wav_buffer, sr, x.astype(np.int16))
-        return wav_buffer.getvalue()
+        # numpy配列をwavバイトに変換（ヘッダーを直接組み立てる）
+        return _wrap_pcm16_mono(x, sr)
 
     async def aclose(self):
-        """定義が必要なので何もしない処理を記述"""
-        pass
+        """合成用のスレッドを終了する"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
 
 
 if __name__ == "__main__":
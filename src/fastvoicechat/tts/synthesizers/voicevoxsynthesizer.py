@@ -1,4 +1,6 @@
 import asyncio
+from collections import OrderedDict
+from typing import Any, Dict, Tuple
 
 import aiohttp
 
@@ -8,7 +10,19 @@ from fastvoicechat.tts.synthesizers.base import BaseSynthesizer
 class VoiceVoxSynthesizer(BaseSynthesizer):
     """VoiceVoxのHTTP APIを非同期で扱うクラス"""
 
-    def __init__(self, host="http://localhost:50021", speaker_id: int = 0, **kwargs):
+    def __init__(
+        self,
+        host="http://localhost:50021",
+        speaker_id: int = 0,
+        query_cache_size: int = 256,
+        **kwargs,
+    ):
+        """
+        Args:
+            host: VoiceVoxエンジンのURL
+            speaker_id: 話者ID
+            query_cache_size: audio_queryの結果をキャッシュする最大件数。0で無効
+        """
         self.host = host if host.startswith("http") else f"http://{host}"
         self._session = None
         self._speakers_cache = None
@@ -16,6 +30,15 @@ class VoiceVoxSynthesizer(BaseSynthesizer):
         self._connection_retries = 3
         self._retry_delay = 1.0  # 初回リトライ待機時間（秒）
 
+        # audio_queryの結果のLRUキャッシュ（同じテキストの合成で問い合わせを省略する）
+        self.query_cache_size = query_cache_size
+        self._query_cache: OrderedDict[Tuple[int, str], bytes] = OrderedDict()
+
+    @property
+    def speaker_id(self) -> int:
+        """話者ID"""
+        return self._speaker_id
+
     async def _aget_session(self) -> aiohttp.ClientSession:
         """HTTPセッションを取得（必要なら作成）"""
         if self._session is None or self._session.closed:
@@ -40,21 +63,17 @@ class VoiceVoxSynthesizer(BaseSynthesizer):
         retry_count = 0
         while retry_count <= self._connection_retries:
             try:
-                # 音声合成クエリを作成
+                # 音声合成クエリを作成（同じテキストはキャッシュから取得）
                 params = {"text": text, "speaker": self._speaker_id}
-                async with session.post(
-                    f"{self.host}/audio_query", params=params
-                ) as response:
-                    response.raise_for_status()
-                    query_data = await response.json()
+                query_data = await self._aaudio_query(session, params)
 
-                # 音声合成を実行
+                # 音声合成を実行（クエリはデコードせずにそのまま送り返す）
                 headers = {"Content-Type": "application/json"}
                 async with session.post(
                     f"{self.host}/synthesis",
                     headers=headers,
                     params=params,
-                    json=query_data,
+                    data=query_data,
                 ) as response:
                     response.raise_for_status()
                     return await response.read()
@@ -68,6 +87,26 @@ class VoiceVoxSynthesizer(BaseSynthesizer):
                 continue
         return b""
 
+    async def _aaudio_query(
+        self, session: aiohttp.ClientSession, params: Dict[str, Any]
+    ) -> bytes:
+        """audio_queryのJSONを取得（キャッシュがあれば問い合わせない）"""
+        key = (params["speaker"], params["text"])
+        query_data = self._query_cache.get(key)
+        if query_data is not None:
+            self._query_cache.move_to_end(key)
+            return query_data
+
+        async with session.post(f"{self.host}/audio_query", params=params) as response:
+            response.raise_for_status()
+            query_data = await response.read()
+
+        if self.query_cache_size > 0:
+            self._query_cache[key] = query_data
+            if len(self._query_cache) > self.query_cache_size:
+                self._query_cache.popitem(last=False)
+        return query_data
+
     async def aclose(self):
         """HTTPセッションを閉じる"""
         if self._session and not self._session.closed:
@@ -1,33 +1,75 @@
 import asyncio
-import io
-import wave
-from typing import Optional
+import logging
+import re
+from collections import OrderedDict, deque
+from typing import Any, Deque, Iterable, List, Optional, Tuple
 
+from fastvoicechat.base import aget_until
 from fastvoicechat.tts.players import BasePlayer
+from fastvoicechat.tts.players._wavcache import decode_wav
 from fastvoicechat.tts.synthesizers import BaseSynthesizer
 
 
+# 文の区切りとみなす文字（LLMの出力を区切る文字と揃える）
+SENTENCE_SEPARATOR = "。！？!?"
+_SENTENCE_PATTERN = re.compile(f"[^{SENTENCE_SEPARATOR}]+[{SENTENCE_SEPARATOR}]*")
+
+
+def split_sentences(text: str) -> List[str]:
+    """テキストを文ごとに分割する（区切り文字は直前の文に含める）"""
+    return _SENTENCE_PATTERN.findall(text) or [text]
+
+
 def calculate_duration(content: bytes) -> float:
-    """音声データの再生時間を計算する"""
-    wav_io = io.BytesIO(content)
-    with wave.open(wav_io, "rb") as wf:
-        frame_rate = wf.getframerate()
-        duration = wf.getnframes() / float(frame_rate)
-    return duration
+    """音声データの再生時間を計算する（プレイヤーと同じデコード結果のキャッシュを使う）"""
+    return decode_wav(content).duration
 
 
 # AsyncTTSクラスを拡張して、さまざまなプレイヤーを選択できるようにする例
 class TTS:
     """非同期テキスト読み上げクラス"""
 
-    def __init__(self, synthesizer: BaseSynthesizer, player: BasePlayer):
+    def __init__(
+        self,
+        synthesizer: BaseSynthesizer,
+        player: BasePlayer,
+        *,
+        cache_size: int = 64,
+        cache_max_text_length: int = 16,
+        cache_max_bytes: int = 10 * 1024 * 1024,
+        prefetch: int = 2,
+    ):
+        """
+        Args:
+            synthesizer: 音声合成エンジン
+            player: 音声プレイヤー
+            cache_size: 合成結果をキャッシュする最大件数。0で無効
+            cache_max_text_length: キャッシュ対象とするテキストの最大文字数。
+                相槌のように繰り返し使われる短い発話だけをキャッシュします
+            cache_max_bytes: キャッシュする音声データの合計の最大バイト数
+            prefetch: 複数の文を読み上げるとき、再生と並行して合成しておく文の数
+        """
         # self.synthesizer = VoiceVoxSynthesizer(voicevox_host)
         self.synthesizer = synthesizer
         self.text = ""
 
+        # 短い発話の合成結果のLRUキャッシュ
+        self.cache_size = cache_size
+        self.cache_max_text_length = cache_max_text_length
+        self.cache_max_bytes = cache_max_bytes
+        self._cache: OrderedDict[Tuple[str, Any], bytes] = OrderedDict()
+        self._cache_bytes = 0
+
+        self.prefetch = prefetch
+
         # プレイヤータイプに応じたプレイヤーを選択
         self.player = player
 
+        # 再生状態の遷移を通知するイベント
+        self.playing_started_event = asyncio.Event()
+        self.playing_ended_event = asyncio.Event()
+        self.playing_ended_event.set()
+
     async def aplay_voice(
         self, text: str, interrupt_event: Optional[asyncio.Event] = None
     ) -> bool:
@@ -45,15 +87,164 @@ class TTS:
             return True
 
         self.text = text
+        sentences = split_sentences(text)
+        if len(sentences) > 1:
+            return await self._aplay_sentences(sentences, interrupt_event)
+
+        try:
+            content = await self.asynthesize(text)
+        except Exception as e:
+            logging.error(f"Error playing voice: {e}")
+            await self.astop()
+            return False
+
+        return await self.aplay_content(content, interrupt_event)
+
+    async def _aplay_sentences(
+        self, sentences: List[str], interrupt_event: Optional[asyncio.Event] = None
+    ) -> bool:
+        """
+        文ごとに合成しながら順に再生する
+
+        全文の合成を待たず、後続の文の合成を前の文の再生と並行して進めます。
+        合成は並行して行いますが、再生は文の順に行います。
+
+        Args:
+            sentences: 再生する文
+            interrupt_event: 再生を中断するためのイベント
+
+        Returns:
+            bool: 正常終了したかどうか（Falseなら中断された）
+        """
+        # 再生順に並べた合成中のタスク（最大prefetch件を先行して合成する）
+        pending: Deque[asyncio.Task] = deque()
+        remaining = iter(sentences)
+
+        def prefetch():
+            while len(pending) < max(self.prefetch, 1):
+                sentence = next(remaining, None)
+                if sentence is None:
+                    return
+                pending.append(asyncio.create_task(self.asynthesize(sentence)))
+
+        waiters = []
+        if interrupt_event is not None:
+            waiters.append(asyncio.create_task(interrupt_event.wait()))
+
+        # 文の間で再生終了を通知しないよう、全文を1回の再生として扱う
+        self.playing_ended_event.clear()
+        self.playing_started_event.set()
+        try:
+            prefetch()
+            while pending:
+                # 合成を待つ間も中断を受け付ける
+                content = await aget_until(lambda: pending[0], waiters)
+                if content is None:
+                    return False
+                pending.popleft()
+                # 再生と並行して後続の文の合成を始めておく
+                prefetch()
+                if not await self.player.aplay_voice(content, interrupt_event):
+                    return False
+            return True
+        except Exception as e:
+            logging.error(f"Error playing voice: {e}")
+            return False
+        finally:
+            for task in pending:
+                if task.done() and not task.cancelled():
+                    # 使わなかった合成結果の例外を回収する
+                    task.exception()
+                task.cancel()
+            for waiter in waiters:
+                waiter.cancel()
+            # 中断・キャンセル時は出力を即座に止める
+            await self.astop()
+            self.playing_started_event.clear()
+            self.playing_ended_event.set()
+
+    async def asynthesize(self, text: str) -> bytes:
+        """
+        テキストを音声データに変換
+
+        再生と切り離して合成だけを先行させたい場合に使用します。
+
+        Args:
+            text: 読み上げるテキスト
+
+        Returns:
+            bytes: WAV形式の音声データ
+        """
+        cacheable = 0 < len(text) <= self.cache_max_text_length and self.cache_size > 0
+        if not cacheable:
+            return await self.synthesizer.asynthesize(text)
+
+        key = (text, getattr(self.synthesizer, "speaker_id", None))
+        content = self._cache.get(key)
+        if content is not None:
+            self._cache.move_to_end(key)
+            return content
+
+        content = await self.synthesizer.asynthesize(text)
+        if len(content) > self.cache_max_bytes:
+            return content
+        old = self._cache.pop(key, None)
+        if old is not None:
+            self._cache_bytes -= len(old)
+        self._cache[key] = content
+        self._cache_bytes += len(content)
+        while (
+            len(self._cache) > self.cache_size
+            or self._cache_bytes > self.cache_max_bytes
+        ):
+            _, evicted = self._cache.popitem(last=False)
+            self._cache_bytes -= len(evicted)
+        return content
+
+    async def aprewarm(self, texts: Iterable[str]) -> None:
+        """
+        よく使う短い発話をあらかじめ合成してキャッシュしておく
+
+        Args:
+            texts: 事前に合成するテキスト
+        """
+        results = await asyncio.gather(
+            *(self.asynthesize(text) for text in texts), return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                logging.warning(f"[TTS]: prewarm failed: {result}")
+
+    async def aplay_content(
+        self, content: bytes, interrupt_event: Optional[asyncio.Event] = None
+    ) -> bool:
+        """
+        合成済みの音声データを再生
+
+        Args:
+            content: WAV形式の音声データ
+            interrupt_event: 再生を中断するためのイベント
+
+        Returns:
+            bool: 正常終了したかどうか（Falseなら中断された）
+        """
+        self.playing_ended_event.clear()
+        self.playing_started_event.set()
         try:
-            content = await self.synthesizer.asynthesize(text)
             result = await self.player.aplay_voice(content, interrupt_event)
             await self.astop()
             return result
+        except asyncio.CancelledError:
+            # 再生タスクがキャンセルされた場合は出力を即座に止める
+            await self.astop()
+            raise
         except Exception as e:
-            print(f"Error playing voice: {e}")
+            logging.error(f"Error playing voice: {e}")
             await self.astop()
             return False
+        finally:
+            self.playing_started_event.clear()
+            self.playing_ended_event.set()
 
     async def astop(self) -> None:
         """再生を停止"""
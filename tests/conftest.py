@@ -0,0 +1,41 @@
+import array
+import functools
+import io
+import math
+import sys
+import wave
+
+import pytest
+
+
+@functools.lru_cache(maxsize=None)
+def _build_wav(duration_sec=0.5, sample_rate=44100, frequency=440.0):
+    """
+    テスト用のWAVデータを生成する関数（同じ引数では生成し直さない）
+    """
+    step = 2 * math.pi * frequency / sample_rate
+    n = int(sample_rate * duration_sec)
+    audio_data = array.array("h", (int(32767 * math.sin(step * i)) for i in range(n)))
+    if sys.byteorder == "big":
+        # WAVはリトルエンディアン
+        audio_data.byteswap()
+
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(sample_rate)
+        wf.writeframes(audio_data.tobytes())
+    return buffer.getvalue()
+
+
+@pytest.fixture(scope="session")
+def create_test_wav_data():
+    """再生時間などを指定してテスト用のWAVデータを生成する関数を提供"""
+    return _build_wav
+
+
+@pytest.fixture(scope="session")
+def test_wav_data():
+    """テスト用のWAVデータ（0.5秒、44.1kHz、440Hz）をフィクスチャとして提供"""
+    return _build_wav(0.5, 44100, 440.0)
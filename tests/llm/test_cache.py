@@ -0,0 +1,36 @@
+from fastvoicechat.llm import SemanticCache
+
+
+def test_get_returns_answer_for_same_input():
+    """同じ入力に対してキャッシュした回答が返ることをテスト"""
+    cache = SemanticCache()
+    cache.put("今日はいい天気ですね", "うん")
+    assert cache.get("今日はいい天気ですね") == "うん"
+
+
+def test_get_returns_none_for_dissimilar_input():
+    """類似していない入力ではキャッシュにヒットしないことをテスト"""
+    cache = SemanticCache()
+    cache.put("今日はいい天気ですね", "うん")
+    assert cache.get("明日の会議は何時から") is None
+
+
+def test_get_returns_none_when_empty():
+    """空のキャッシュではNoneが返ることをテスト"""
+    cache = SemanticCache()
+    assert cache.get("こんにちは") is None
+
+
+def test_put_evicts_least_frequently_used():
+    """容量を超えたとき参照回数の少ないエントリが削除されることをテスト"""
+    cache = SemanticCache(max_size=2)
+    cache.put("今日はいい天気ですね", "うん")
+    cache.put("明日の会議は何時から", "えーっと")
+    assert cache.get("今日はいい天気ですね") == "うん"
+
+    cache.put("お腹がすいてきました", "あー")
+
+    assert len(cache) == 2
+    assert cache.get("今日はいい天気ですね") == "うん"
+    assert cache.get("明日の会議は何時から") is None
+    assert cache.get("お腹がすいてきました") == "あー"
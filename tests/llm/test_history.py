@@ -0,0 +1,32 @@
+import pytest
+
+from fastvoicechat.llm import ConversationHistory
+
+
+@pytest.mark.asyncio
+async def test_aextend_keeps_existing_prefix():
+    """追加しても既存の履歴（メッセージ形式を含む）が変わらないことをテスト"""
+    history = ConversationHistory([("user", "こんにちは"), ("assistant", "うん")])
+    prefix = history.message_dicts
+
+    await history.aextend([("user", "元気？"), ("assistant", "元気だよ")])
+
+    assert history.message_dicts[: len(prefix)] == prefix
+    assert all(a is b for a, b in zip(history.message_dicts, prefix))
+    assert history.messages[-1] == ("assistant", "元気だよ")
+    assert len(history) == 4
+
+
+def test_window_dicts_trims_in_blocks():
+    """上限を超えた履歴が一定件数単位で切り捨てられることをテスト"""
+    history = ConversationHistory([("user", str(i)) for i in range(5)])
+    assert len(history.window_dicts(None)) == 5
+    assert len(history.window_dicts(8)) == 5
+
+    history = ConversationHistory([("user", str(i)) for i in range(9)])
+    window = history.window_dicts(8)
+    assert [m["content"] for m in window] == ["4", "5", "6", "7", "8"]
+
+    history = ConversationHistory([("user", str(i)) for i in range(12)])
+    window = history.window_dicts(8)
+    assert [m["content"] for m in window] == [str(i) for i in range(4, 12)]
@@ -0,0 +1,11 @@
+from fastvoicechat.llm import LLM, ConversationHistory
+
+
+def test_llms_share_empty_history():
+    """空の履歴を渡した場合も、複数のLLMで同じ履歴を共有することをテスト"""
+    history = ConversationHistory()
+    llm_backchannel = LLM(history=history)
+    llm_answer = LLM(history=history)
+
+    assert llm_backchannel.conversation_history is history
+    assert llm_answer.conversation_history is history
@@ -0,0 +1,80 @@
+import asyncio
+
+import pytest
+
+from fastvoicechat.stt.capture import AudioRingBuffer
+
+
+def test_readers_receive_frames_independently():
+    """各読み手が書き込まれたフレームをそれぞれ受け取ることをテスト"""
+    ring = AudioRingBuffer(frame_bytes=4, capacity=4)
+    reader1 = ring.create_reader()
+    reader2 = ring.create_reader()
+
+    ring.write(b"aaaa")
+    ring.write(b"bbbb")
+
+    assert reader1.get_nowait() == b"aaaa"
+    assert reader1.get_nowait() == b"bbbb"
+    assert reader1.empty()
+    assert reader2.qsize() == 2
+    assert reader2.get_nowait() == b"aaaa"
+
+
+def test_reader_skips_overwritten_frames():
+    """容量を超えて遅れた読み手が古いフレームを読み飛ばすことをテスト"""
+    ring = AudioRingBuffer(frame_bytes=2, capacity=2)
+    reader = ring.create_reader()
+
+    for frame in (b"aa", b"bb", b"cc"):
+        ring.write(frame)
+
+    assert reader.get_nowait() == b"bb"
+    assert reader.get_nowait() == b"cc"
+    with pytest.raises(asyncio.QueueEmpty):
+        reader.get_nowait()
+
+
+@pytest.mark.asyncio
+async def test_get_waits_for_next_frame():
+    """getが次のフレームの書き込みまで待機することをテスト"""
+    ring = AudioRingBuffer(frame_bytes=2, capacity=4)
+    reader = ring.create_reader()
+
+    get_task = asyncio.create_task(reader.get())
+    await asyncio.sleep(0)
+    assert not get_task.done()
+
+    ring.write(b"aa")
+    assert await asyncio.wait_for(get_task, timeout=1) == b"aa"
+
+
+@pytest.mark.asyncio
+async def test_get_view_returns_frame_without_copy():
+    """get_viewがバッファ上のフレームをそのまま返すことをテスト"""
+    ring = AudioRingBuffer(frame_bytes=2, capacity=2)
+    reader = ring.create_reader()
+
+    ring.write(b"aa")
+    view = await reader.get_view()
+    assert isinstance(view, memoryview)
+    assert bytes(view) == b"aa"
+    assert reader.empty()
+
+
+@pytest.mark.asyncio
+async def test_aread_waits_until_enough_bytes():
+    """areadが指定バイト数分のフレームが揃うまで待ち、連結して返すことをテスト"""
+    ring = AudioRingBuffer(frame_bytes=2, capacity=8)
+    reader = ring.create_reader()
+
+    read_task = asyncio.create_task(reader.aread(6))
+    ring.write(b"aa")
+    ring.write(b"bb")
+    await asyncio.sleep(0)
+    assert not read_task.done()
+
+    ring.write(b"cc")
+    ring.write(b"dd")
+    assert await asyncio.wait_for(read_task, timeout=1) == b"aabbcc"
+    assert reader.get_nowait() == b"dd"
@@ -0,0 +1,33 @@
+import pytest
+
+from fastvoicechat.stt.recognition.googlespeechrecognition import (
+    GoogleSpeechRecognition,
+)
+
+
+class FailingReader:
+    """音声の取得で常に例外を送出する読み手"""
+
+    async def aread(self, nbytes):
+        raise ValueError(f"nbytes is too large: {nbytes}")
+
+
+class FakeSpeechClient:
+    """リクエストを最後まで読み、レスポンスを返さないクライアント"""
+
+    def streaming_recognize(self, config, requests):
+        for _ in requests:
+            pass
+        return iter([])
+
+
+@pytest.mark.asyncio
+@pytest.mark.timeout(5, method="thread")
+async def test_session_fails_when_chunk_source_raises():
+    """音声の取得で例外が発生した場合に、セッションが失敗として扱われることをテスト"""
+    recognition = GoogleSpeechRecognition(audio_queue=FailingReader())
+    recognition._speech_client = FakeSpeechClient()
+
+    succeeded = await recognition._arun_recognition_session()
+
+    assert succeeded is False
@@ -0,0 +1,22 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from fastvoicechat.fvchat import FastVoiceChat
+
+
+@pytest.mark.asyncio
+async def test_backchannel_cache_hit_does_not_grow_cache():
+    """相槌キャッシュにヒットした場合に、同じ相槌が再登録されないことをテスト"""
+    fvc = FastVoiceChat(tts=MagicMock())
+    fvc.llm_backchannel = AsyncMock()
+    fvc.llm_answer = AsyncMock()
+    fvc.backchannel_cache.put("今日はいい天気ですね", "うん")
+
+    await fvc._astart_backchannel("今日はいい天気ですね")
+    await fvc._astart_backchannel("今日はいい天気ですね")
+    await fvc._await_speculative_answer()
+
+    assert len(fvc.backchannel_cache) == 1
+    fvc.llm_backchannel.aput_answer.assert_awaited_with("今日はいい天気ですね", "うん")
+    fvc.llm_backchannel.astart_generate_task.assert_not_called()
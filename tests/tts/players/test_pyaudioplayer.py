@@ -1,39 +1,22 @@
 import asyncio
-import io
-import wave
+import time
 from unittest.mock import MagicMock, patch
 
-import numpy as np
 import pytest
 
 from fastvoicechat.tts.players import PyAudioPlayer
+from fastvoicechat.tts.players import pyaudioplayer
 
 # WIP
 # --- テスト用ヘルパー関数群 ---
 
 
-def create_test_wav_data(duration_sec=0.5, sample_rate=44100, frequency=440.0):
-    """
-    テスト用のWAVデータを生成する関数
-    """
-    t = np.linspace(0, duration_sec, int(sample_rate * duration_sec), False)
-    samples = np.sin(2 * np.pi * frequency * t) * 32767
-    audio_data = samples.astype(np.int16)
-
-    buffer = io.BytesIO()
-    with wave.open(buffer, "wb") as wf:
-        wf.setnchannels(1)
-        wf.setsampwidth(2)
-        wf.setframerate(sample_rate)
-        wf.writeframes(audio_data.tobytes())
-    buffer.seek(0)
-    return buffer.read()
-
-
-@pytest.fixture
-def test_wav_data():
-    """テスト用のWAVデータをフィクスチャとして提供"""
-    return create_test_wav_data()
+@pytest.fixture(autouse=True)
+def reset_shared_pyaudio():
+    """テストごとにモックのPyAudioを使うよう、共有インスタンスをリセットする"""
+    pyaudioplayer._pyaudio_instance = None
+    yield
+    pyaudioplayer._pyaudio_instance = None
 
 
 # --- テストケース ---
@@ -111,7 +94,7 @@ class TestPyAudioPlayer:
         mock_stream.stop_stream.assert_called_once()
         # 正常系ではcloseは呼ばれない
         mock_stream.close.assert_not_called()
-        mock_pyaudio.terminate.assert_not_called()  # terminateは__del__で呼ばれる
+        mock_pyaudio.terminate.assert_not_called()  # terminateはプロセス終了時に呼ばれる
 
     @pytest.mark.asyncio
     @patch("pyaudio.PyAudio")
@@ -125,6 +108,8 @@ class TestPyAudioPlayer:
 
         # ストリームを常にアクティブに設定
         mock_stream.is_active.return_value = True
+        # 書き込みは再生が進むまでブロックする動作を模倣
+        mock_stream.write.side_effect = lambda *args, **kwargs: time.sleep(0.1)
 
         # プレイヤーの作成
         player = PyAudioPlayer()
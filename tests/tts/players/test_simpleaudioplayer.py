@@ -1,9 +1,7 @@
 import asyncio
-import io
-import wave
+import threading
 from unittest.mock import MagicMock, patch
 
-import numpy as np
 import pytest
 
 from fastvoicechat.tts.players import SimpleAudioPlayer
@@ -11,30 +9,6 @@ from fastvoicechat.tts.players import SimpleAudioPlayer
 # --- テスト用ヘルパー関数群 ---
 
 
-def create_test_wav_data(duration_sec=0.5, sample_rate=44100, frequency=440.0):
-    """
-    テスト用のWAVデータを生成する関数
-    """
-    t = np.linspace(0, duration_sec, int(sample_rate * duration_sec), False)
-    samples = np.sin(2 * np.pi * frequency * t) * 32767
-    audio_data = samples.astype(np.int16)
-
-    buffer = io.BytesIO()
-    with wave.open(buffer, "wb") as wf:
-        wf.setnchannels(1)
-        wf.setsampwidth(2)
-        wf.setframerate(sample_rate)
-        wf.writeframes(audio_data.tobytes())
-    buffer.seek(0)
-    return buffer.read()
-
-
-@pytest.fixture
-def test_wav_data():
-    """テスト用のWAVデータをフィクスチャとして提供"""
-    return create_test_wav_data()
-
-
 def create_play_object_mock():
     """
     simpleaudio.PlayObject をモックするためのヘルパー関数。
@@ -45,6 +19,10 @@ def create_play_object_mock():
     play_obj.is_playing.side_effect = (
         lambda: is_playing_values.pop(0) if is_playing_values else False
     )
+    # wait_done は再生が終わるか stop が呼ばれるまでブロックする
+    stopped = threading.Event()
+    play_obj.stop.side_effect = stopped.set
+    play_obj.wait_done.side_effect = lambda: stopped.wait(0.03)
 
     return play_obj
 
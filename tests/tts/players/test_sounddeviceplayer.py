@@ -1,97 +1,81 @@
 import asyncio
 import io
+import threading
 import wave
 from unittest.mock import MagicMock, patch
 
-import numpy as np
 import pytest
+import sounddevice
 
 from fastvoicechat.tts.players import SoundDevicePlayer
 
-# --- テスト用ヘルパー関数群 ---
-
-
-def create_test_wav_data(duration_sec=0.5, sample_rate=44100, frequency=440.0):
-    """
-    テスト用のWAVデータを生成する関数
-    """
-    t = np.linspace(0, duration_sec, int(sample_rate * duration_sec), False)
-    samples = np.sin(2 * np.pi * frequency * t) * 32767
-    audio_data = samples.astype(np.int16)
-
-    buffer = io.BytesIO()
-    with wave.open(buffer, "wb") as wf:
-        wf.setnchannels(1)
-        wf.setsampwidth(2)
-        wf.setframerate(sample_rate)
-        wf.writeframes(audio_data.tobytes())
-    buffer.seek(0)
-    return buffer.read()
-
-
-@pytest.fixture
-def test_wav_data():
-    """テスト用のWAVデータをフィクスチャとして提供"""
-    return create_test_wav_data()
-
-
 # --- テストケース ---
 
 
-def create_mock_behavior():
+def create_mock_behavior(block_interval=0.001):
     """
     sounddeviceモジュールのモックを作成する関数
+    Args:
+        block_interval: 1ブロック出力するごとの待ち時間（秒）
     Returns:
         dict: sounddeviceモジュールのモック。
-        play, get_stream, stopなどの主要な関数を含みます。
+        RawOutputStreamと、出力されたバイト列、作成されたストリームを含みます。
     """
-    is_play_called = False
-    mock_stream = MagicMock()
-
-    # get_streamの動作設定
-    def get_stream_behavior():
-        nonlocal is_play_called
-        nonlocal mock_stream
-
-        if not is_play_called:
-            raise RuntimeError("No active stream")
+    output = bytearray()
+    streams = []
+
+    # RawOutputStreamの動作設定
+    # startするとPortAudioのスレッドのように、別スレッドからコールバックを繰り返し呼ぶ
+    def raw_output_stream_behavior(*args, callback, finished_callback=None, **kwargs):
+        mock_stream = MagicMock()
+        stopped = threading.Event()
+        mock_stream.active = False
+
+        def run():
+            frames = 1024
+            outdata = bytearray(frames * 2)
+            while not stopped.is_set():
+                try:
+                    callback(outdata, frames, None, None)
+                except sounddevice.CallbackStop:
+                    # CallbackStopを送出したブロックも出力してから終了する
+                    output.extend(outdata)
+                    break
+                output.extend(outdata)
+                stopped.wait(block_interval)
+            mock_stream.active = False
+            if finished_callback is not None:
+                finished_callback()
+
+        def start_behavior():
+            mock_stream.active = True
+            threading.Thread(target=run, daemon=True).start()
+
+        # closeの動作設定
+        def close_behavior():
+            stopped.set()
+            mock_stream.active = False
+
+        mock_stream.start.side_effect = start_behavior
+        mock_stream.close.side_effect = close_behavior
+        streams.append(mock_stream)
         return mock_stream
 
-    # playの動作設定
-    def play_behavior(*args, **kwargs):
-        nonlocal is_play_called
-        nonlocal mock_stream
-
-        stream_active = [True, True, False]  # 待機ループの３回目で終了する動作を模倣
-        is_play_called = True
-        # ストリームのactiveプロパティを設定
-        type(mock_stream).active = property(
-            lambda self: stream_active.pop(0) if stream_active else False
-        )
-
-    # stopの動作設定
-    def stop_behavior():
-        nonlocal mock_stream
-
-        type(mock_stream).active = False
-
     return {
-        "get_stream": get_stream_behavior,
-        "play": play_behavior,
-        "stop": stop_behavior,
+        "RawOutputStream": raw_output_stream_behavior,
+        "output": output,
+        "streams": streams,
     }
 
 
 class TestSoundDevicePlayer:
     @pytest.mark.asyncio
-    @patch("sounddevice.play")
-    @patch("sounddevice.get_stream")
+    @patch("sounddevice.RawOutputStream")
     async def test_play_voice_normal_completion(
-        self, mock_get_stream, mock_play, test_wav_data
+        self, mock_raw_output_stream, test_wav_data
     ):
         mock_behavior = create_mock_behavior()
-        mock_get_stream.side_effect = mock_behavior["get_stream"]
-        mock_play.side_effect = mock_behavior["play"]
+        mock_raw_output_stream.side_effect = mock_behavior["RawOutputStream"]
 
         """
         正常に再生完了する場合のテスト。
@@ -100,24 +84,43 @@ class TestSoundDevicePlayer:
         result = await player.aplay_voice(test_wav_data)
 
         assert result is True  # 正常終了
-        mock_play.assert_called_once()
-        # 再生が完了するまでget_streamが複数回呼ばれることを確認
-        assert mock_get_stream.call_count > 1
+        mock_raw_output_stream.assert_called_once()
+        # 音声データがすべて出力されることを確認
+        with wave.open(io.BytesIO(test_wav_data), "rb") as wf:
+            frames = wf.readframes(wf.getnframes())
+        assert bytes(mock_behavior["output"][: len(frames)]) == frames
+        assert not player.is_playing
+        player.close()
 
     @pytest.mark.asyncio
-    @patch("sounddevice.play")
-    @patch("sounddevice.get_stream")
-    @patch("sounddevice.stop")
+    @patch("sounddevice.RawOutputStream")
+    async def test_play_voice_reuses_stream(
+        self, mock_raw_output_stream, test_wav_data
+    ):
+        """
+        同じフォーマットの音声を続けて再生する場合は、ストリームを開き直さないことのテスト。
+        """
+        mock_behavior = create_mock_behavior()
+        mock_raw_output_stream.side_effect = mock_behavior["RawOutputStream"]
+
+        player = SoundDevicePlayer()
+        assert await player.aplay_voice(test_wav_data) is True
+        assert await player.aplay_voice(test_wav_data) is True
+
+        mock_raw_output_stream.assert_called_once()
+        mock_behavior["streams"][0].close.assert_not_called()
+        player.close()
+
+    @pytest.mark.asyncio
+    @patch("sounddevice.RawOutputStream")
     async def test_play_voice_with_interrupt(
-        self, mock_stop, mock_get_stream, mock_play, test_wav_data
+        self, mock_raw_output_stream, test_wav_data
     ):
         """
         割り込みイベントによって再生が中断される場合のテスト。
         """
-        mock_behavior = create_mock_behavior()
-        mock_get_stream.side_effect = mock_behavior["get_stream"]
-        mock_play.side_effect = mock_behavior["play"]
-        mock_stop.side_effect = mock_behavior["stop"]
+        mock_behavior = create_mock_behavior(block_interval=0.01)
+        mock_raw_output_stream.side_effect = mock_behavior["RawOutputStream"]
 
         interrupt_event = asyncio.Event()
 
@@ -132,3 +135,52 @@ class TestSoundDevicePlayer:
         result = await play_task
 
         assert result is False  # 中断されたのでFalseが返される
+        assert not player.is_playing
+        player.close()
+
+    @pytest.mark.asyncio
+    @patch("sounddevice.RawOutputStream")
+    async def test_play_voice_stopped_from_another_task(
+        self, mock_raw_output_stream, create_test_wav_data
+    ):
+        """
+        割り込みイベントなしで再生中に、別のタスクからastopされた場合に再生が終了することのテスト。
+        """
+        mock_behavior = create_mock_behavior(block_interval=0.01)
+        mock_raw_output_stream.side_effect = mock_behavior["RawOutputStream"]
+
+        player = SoundDevicePlayer()
+        play_task = asyncio.create_task(player.aplay_voice(create_test_wav_data(2)))
+
+        await asyncio.sleep(0.1)
+        await player.astop()
+
+        result = await asyncio.wait_for(play_task, timeout=1.0)
+
+        assert result is False  # 停止されたのでFalseが返される
+        assert not player.is_playing
+        player.close()
+
+    @pytest.mark.asyncio
+    @patch("sounddevice.RawOutputStream")
+    async def test_play_voice_preempted_by_next_voice(
+        self, mock_raw_output_stream, create_test_wav_data, test_wav_data
+    ):
+        """
+        再生中に次の音声の再生が始まった場合に、先の再生がFalseで終了することのテスト。
+        """
+        mock_behavior = create_mock_behavior(block_interval=0.001)
+        mock_raw_output_stream.side_effect = mock_behavior["RawOutputStream"]
+
+        player = SoundDevicePlayer()
+        first_task = asyncio.create_task(player.aplay_voice(create_test_wav_data(2)))
+
+        await asyncio.sleep(0.01)
+        second_result = await asyncio.wait_for(
+            player.aplay_voice(test_wav_data), timeout=1.0
+        )
+        first_result = await asyncio.wait_for(first_task, timeout=1.0)
+
+        assert first_result is False
+        assert second_result is True
+        player.close()
@@ -1,10 +1,9 @@
 import asyncio
-import io
 import socket
-import wave
+import threading
+import time
 from typing import AsyncGenerator, Tuple
 
-import numpy as np
 import pytest
 import pytest_asyncio
 
@@ -18,21 +17,39 @@ async def server() -> AsyncGenerator[
     """テスト用のTCPサーバーを提供するフィクスチャ"""
     received_data: list[tuple[str, bytes]] = []
     server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-    server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-    server_socket.bind(("localhost", 12346))
+    # 空いているポートを割り当てる（テスト間やxdistのワーカー間で衝突しないように）
+    server_socket.bind(("localhost", 0))
     server_socket.listen(1)
-    server_socket.settimeout(0.1)  # タイムアウトを1秒に延長
-
-    async def handle_client():
-        while True:
+    # 停止を確認する間隔
+    server_socket.settimeout(0.1)
+
+    # クライアントはイベントループ上で非同期に送信するため、
+    # ブロッキングで受信するサーバーはループを止めないよう別スレッドで動かす
+    stop_event = threading.Event()
+
+    def recv_exact(client: socket.socket, size: int) -> bytes:
+        """指定したバイト数を受信する（途中で切断された場合はそこまで）"""
+        buffer = bytearray(size)
+        view = memoryview(buffer)
+        received = 0
+        while received < size:
+            n = client.recv_into(view[received:])
+            if n == 0:
+                break
+            received += n
+        return bytes(view[:received])
+
+    def handle_client():
+        while not stop_event.is_set():
             try:
                 print("DEBUG: サーバー: 接続待ち")
                 client, _ = server_socket.accept()
+                client.settimeout(1.0)
                 print("DEBUG: サーバー: 新しい接続を受け付け")
                 # コマンドサイズを読み取り
-                cmd_size = int.from_bytes(client.recv(4), byteorder="big")
+                cmd_size = int.from_bytes(recv_exact(client, 4), byteorder="big")
                 # コマンドを読み取り
-                cmd = client.recv(cmd_size).decode("utf-8")
+                cmd = recv_exact(client, cmd_size).decode("utf-8")
                 print(f"DEBUG: サーバー: コマンド '{cmd}' を受信")
 
                 if cmd == "stop_wav":
@@ -40,67 +57,47 @@ async def server() -> AsyncGenerator[
                     print("DEBUG: サーバー: stop_wavコマンドを処理")
                 elif cmd == "play_wav":
                     # データサイズを読み取り
-                    data_size = int.from_bytes(client.recv(4), byteorder="big")
+                    data_size = int.from_bytes(recv_exact(client, 4), byteorder="big")
                     print(f"DEBUG: サーバー: {data_size}バイトのデータを受信開始")
                     # データを読み取り
-                    data = b""
-                    while len(data) < data_size:
-                        chunk = client.recv(min(4096, data_size - len(data)))
-                        if not chunk:
-                            break
-                        data += chunk
+                    data = recv_exact(client, data_size)
                     received_data.append((cmd, data))
                     print("DEBUG: サーバー: play_wavコマンドを処理")
 
                 client.close()
                 print("DEBUG: サーバー: 接続を閉じました")
             except socket.timeout:
-                # タイムアウトは正常なケース
-                await asyncio.sleep(0.01)
+                # タイムアウトは正常なケース（停止を確認する）
+                continue
             except Exception as e:
                 print(f"DEBUG: サーバー: エラー発生 - {e}")
-                await asyncio.sleep(0.01)
+                time.sleep(0.01)
 
-    server_task = asyncio.create_task(handle_client())
+    server_thread = threading.Thread(target=handle_client, daemon=True)
+    server_thread.start()
 
     try:
         yield server_socket, received_data
     finally:
-        server_task.cancel()
-        await asyncio.sleep(0.1)  # タスクのキャンセルを待つ
+        stop_event.set()
+        server_thread.join(1.0)  # スレッドの終了を待つ
         server_socket.close()
 
 
-def create_test_wav_data(duration_sec: float = 1.0) -> bytes:
-    """テスト用のWAVデータを生成するフィクスチャ"""
-    sample_rate = 44100
-    frequency = 440.0
-    t = np.linspace(0, duration_sec, int(sample_rate * duration_sec), False)
-    samples = np.sin(2 * np.pi * frequency * t) * 32767
-    audio_data = samples.astype(np.int16)
-    buffer = io.BytesIO()
-    with wave.open(buffer, "wb") as wf:
-        wf.setnchannels(1)
-        wf.setsampwidth(2)
-        wf.setframerate(sample_rate)
-        wf.writeframes(audio_data.tobytes())
-    buffer.seek(0)
-    return buffer.read()
-
-
 @pytest.mark.asyncio
 @pytest.mark.timeout(5, method="thread")
-async def test_play_voice(server: Tuple[socket.socket, list[tuple[str, bytes]]]):
+async def test_play_voice(
+    server: Tuple[socket.socket, list[tuple[str, bytes]]], test_wav_data: bytes
+):
     """音声送信のテスト"""
     print("1. テスト開始")
     server_socket, received_data = server
     print("2. サーバーフィクスチャ取得完了")
-    player = TCPIPPlayer(host="localhost", port=12346)
+    player = TCPIPPlayer(host="localhost", port=server_socket.getsockname()[1])
     print("3. プレイヤー作成完了")
 
     # 音声データを送信
     print("4. 音声データ送信開始")
-    test_wav_data = create_test_wav_data(0.5)
     result = await player.aplay_voice(test_wav_data)
     print("5. 音声データ送信完了")
     assert result is True
@@ -120,10 +117,11 @@ async def test_play_voice(server: Tuple[socket.socket, list[tuple[str, bytes]]])
 @pytest.mark.timeout(10, method="thread")
 async def test_play_voice_with_interrupt(
     server: Tuple[socket.socket, list[tuple[str, bytes]]],
+    create_test_wav_data,
 ):
     """音声送信の中断テスト"""
     server_socket, received_data = server
-    player = TCPIPPlayer(host="localhost", port=12346)
+    player = TCPIPPlayer(host="localhost", port=server_socket.getsockname()[1])
 
     # 中断イベントを作成
     interrupt_event = asyncio.Event()
@@ -152,7 +150,7 @@ async def test_play_voice_with_interrupt(
 async def test_stop(server: Tuple[socket.socket, list[tuple[str, bytes]]]):
     """停止コマンドのテスト"""
     server_socket, received_data = server
-    player = TCPIPPlayer(host="localhost", port=12346)
+    player = TCPIPPlayer(host="localhost", port=server_socket.getsockname()[1])
 
     # 停止コマンドを送信
     await player.astop()
@@ -165,16 +163,17 @@ async def test_stop(server: Tuple[socket.socket, list[tuple[str, bytes]]]):
 
 @pytest.mark.asyncio
 @pytest.mark.timeout(5, method="thread")
-async def test_is_playing(server: Tuple[socket.socket, list[tuple[str, bytes]]]):
+async def test_is_playing(
+    server: Tuple[socket.socket, list[tuple[str, bytes]]], test_wav_data: bytes
+):
     """is_playingプロパティのテスト"""
     server_socket, received_data = server
-    player = TCPIPPlayer(host="localhost", port=12346)
+    player = TCPIPPlayer(host="localhost", port=server_socket.getsockname()[1])
 
     # 再生開始前はFalse
     assert player.is_playing is False
 
     # 再生開始
-    test_wav_data = create_test_wav_data(0.5)
     play_task = asyncio.create_task(player.aplay_voice(test_wav_data))
     await asyncio.sleep(0.02)  # 待機時間を短縮
 
@@ -192,13 +191,13 @@ async def test_is_playing(server: Tuple[socket.socket, list[tuple[str, bytes]]])
 @pytest.mark.asyncio
 async def test_is_playing_with_stop(
     server: Tuple[socket.socket, list[tuple[str, bytes]]],
+    test_wav_data: bytes,
 ):
     """is_playingプロパティの停止時の動作テスト"""
     server_socket, received_data = server
-    player = TCPIPPlayer(host="localhost", port=12346)
+    player = TCPIPPlayer(host="localhost", port=server_socket.getsockname()[1])
 
     # 再生開始
-    test_wav_data = create_test_wav_data(0.5)
     _ = asyncio.create_task(player.aplay_voice(test_wav_data))
     await asyncio.sleep(0.02)  # 待機時間を短縮
 
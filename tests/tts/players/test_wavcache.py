@@ -0,0 +1,69 @@
+import io
+import wave
+from collections import OrderedDict
+
+import numpy as np
+
+from fastvoicechat.tts.players import _wavcache
+from fastvoicechat.tts.players._wavcache import decode_wav, decode_wav_array
+
+
+def create_test_wav_data(channels=1, sample_rate=16000):
+    """テスト用のWAVデータを生成する関数"""
+    audio_data = np.arange(8 * channels, dtype=np.int16)
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wf:
+        wf.setnchannels(channels)
+        wf.setsampwidth(2)
+        wf.setframerate(sample_rate)
+        wf.writeframes(audio_data.tobytes())
+    return buffer.getvalue()
+
+
+def test_decode_wav_caches_result():
+    """同じWAVデータのデコード結果が使い回されることをテスト"""
+    content = create_test_wav_data()
+
+    wav = decode_wav(content)
+    assert wav.channels == 1
+    assert wav.sample_width == 2
+    assert wav.sample_rate == 16000
+    assert decode_wav(bytes(content)) is wav
+
+
+def test_decode_wav_array_reshapes_by_channels():
+    """チャンネル数に応じた2次元配列が返されることをテスト"""
+    audio_data, sample_rate = decode_wav_array(create_test_wav_data(channels=2))
+
+    assert sample_rate == 16000
+    assert audio_data.shape == (8, 2)
+    assert audio_data.dtype == np.int16
+    assert audio_data[1, 0] == 2
+
+
+def test_decode_wav_duration():
+    """フレーム数とサンプリングレートから再生時間が計算されることをテスト"""
+    wav = decode_wav(create_test_wav_data(channels=2, sample_rate=8))
+
+    assert wav.duration == 1.0
+
+
+
+def test_decode_wav_cache_is_bounded_by_bytes(monkeypatch):
+    """合計バイト数の上限を超えないよう、古い結果や大きな音声がキャッシュされないことをテスト"""
+    monkeypatch.setattr(_wavcache, "_cache", OrderedDict())
+    monkeypatch.setattr(_wavcache, "_cache_bytes", 0)
+    small = create_test_wav_data()
+    large = create_test_wav_data(channels=2)
+    monkeypatch.setattr(_wavcache, "WAV_CACHE_MAX_BYTES", len(large))
+
+    # 古い結果から捨てて上限に収める
+    wav = decode_wav(small)
+    assert decode_wav(bytes(small)) is wav
+    decode_wav(large)
+    assert decode_wav(bytes(small)) is not wav
+    assert _wavcache._cache_bytes <= len(large)
+
+    # 上限より大きい音声はキャッシュしない
+    monkeypatch.setattr(_wavcache, "WAV_CACHE_MAX_BYTES", len(small))
+    assert decode_wav(large) is not decode_wav(bytes(large))